@@ -0,0 +1,126 @@
+import hashlib
+import inspect
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoc_2022 import input_store
+from aoc_2022.utils import CACHE_DIR, UTF8, get_cache_file, write_atomically
+
+ANSWER_CACHE_DIR = CACHE_DIR.parent.joinpath("answers")
+PACKAGE_NAME = __name__.partition(".")[0]
+
+__all__ = ["load_answers", "make_key", "save_answers"]
+
+
+def get_dependencies(module: ModuleType) -> list[ModuleType]:
+    """Find every module of this package that a solution module relies on.
+
+    Args
+    ----
+        module (ModuleType): the solution module.
+
+    Returns
+    -------
+        list[ModuleType]: the module itself and its in-package dependencies, sorted
+            by name.
+    """
+    found = {module.__name__: module}
+    to_visit = [module]
+
+    while to_visit:
+        for value in vars(to_visit.pop()).values():
+            dependency = value if inspect.ismodule(value) else inspect.getmodule(value)
+            if (
+                dependency is None
+                or dependency.__name__.partition(".")[0] != PACKAGE_NAME
+                or dependency.__name__ in found
+            ):
+                continue
+
+            found[dependency.__name__] = dependency
+            to_visit.append(dependency)
+
+    return [found[name] for name in sorted(found)]
+
+
+def make_key(
+    puzzle_id: int, module: ModuleType, input_id: str | None = None
+) -> str | None:
+    """Make the cache key for a solution's answers on the cached puzzle input.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        module (ModuleType): the solution module.
+        input_id (str | None, optional): the name of the input in the input store
+            the solution is run on, rather than the downloaded input. Defaults to
+            None.
+
+    Returns
+    -------
+        str | None: a hash of the input bytes and the solution's source, or None if
+            the input hasn't been cached yet.
+    """
+    if input_id is not None:
+        # The store already knows the checksum, so there's no need to decompress
+        entry = input_store.read_index().get(input_store.get_key(puzzle_id, input_id))
+        if entry is None:
+            return None
+        key = hashlib.sha256(entry.checksum.encode(UTF8))
+    else:
+        cache_file = get_cache_file(puzzle_id)
+        if not cache_file.exists():
+            return None
+        key = hashlib.sha256(cache_file.read_bytes())
+
+    for dependency in get_dependencies(module):
+        key.update(inspect.getsource(dependency).encode(UTF8))
+
+    return key.hexdigest()
+
+
+def _answer_file(puzzle_id: int) -> Path:
+    return ANSWER_CACHE_DIR.joinpath(f"answers_{puzzle_id:02}.json")
+
+
+def load_answers(puzzle_id: int, key: str) -> tuple[Any, Any] | None:
+    """Load cached answers for a puzzle.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        key (str): the cache key the answers must have been stored under.
+
+    Returns
+    -------
+        tuple[Any, Any] | None: the answers to both parts, or None on a cache miss.
+    """
+    try:
+        with _answer_file(puzzle_id).open(mode="r", encoding=UTF8) as f:
+            entry = json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return None
+
+    if entry.get("key") != key:
+        return None
+
+    a, b = entry["answers"]
+    return (a, b)
+
+
+def save_answers(puzzle_id: int, key: str, answers: tuple[Any, Any]) -> None:
+    """Save the answers for a puzzle to the cache.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        key (str): the cache key to store the answers under.
+        answers (tuple[Any, Any]): the answers to both parts.
+    """
+    ANSWER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    entry = {"key": key, "answers": list(answers)}
+    # Several days may be saved at once, and a reader must never see a partial file
+    write_atomically([json.dumps(entry).encode(UTF8)], _answer_file(puzzle_id))
@@ -0,0 +1,160 @@
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from multiprocessing.sharedctypes import RawArray
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from aoc_2022 import budgets, utils
+
+# Input files are named for their day, e.g. input_01.txt or input_01_alice.txt
+INPUT_FILE_PATTERN = re.compile(r"input_(\d+)")
+
+__all__ = ["BatchResult", "find_inputs", "run_batch", "solve_input", "to_json"]
+
+# Flags which inputs a worker has started on, shared with each worker of a pool
+_started: Any = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    puzzle_id: int
+    input_file: str
+    answers: list[Any] | None
+    seconds: float
+    error: str | None = None
+
+
+def find_inputs(
+    inputs_dir: Path, puzzle_id: int | None = None
+) -> list[tuple[int, Path]]:
+    """Find the input files in a directory, and the day each one is for.
+
+    Args
+    ----
+        inputs_dir (Path): the directory, which is searched recursively.
+        puzzle_id (int | None, optional): only find inputs for this puzzle ID (day
+            number). Defaults to None, which finds inputs for every day.
+
+    Returns
+    -------
+        list[tuple[int, Path]]: the puzzle ID and path of each input, sorted.
+    """
+    found = []
+    for path in inputs_dir.rglob("*"):
+        if not path.is_file() or not (match := INPUT_FILE_PATTERN.match(path.name)):
+            continue
+        if puzzle_id is None or int(match.group(1)) == puzzle_id:
+            found.append((int(match.group(1)), path))
+
+    return sorted(found)
+
+
+def warm_up(puzzle_ids: Iterable[int], started: Any = None) -> None:
+    global _started
+    _started = started
+
+    # Imported modules stay in each worker for every task it takes on afterwards
+    for puzzle_id in puzzle_ids:
+        utils.import_solution(puzzle_id)
+
+
+def _solve_tracked(
+    index: int, solve: Callable[[int, Path], BatchResult], *task: Any
+) -> BatchResult:
+    _started[index] = 1
+    return solve(*task)
+
+
+def _solve_alone(puzzle_id: int, input_file: Path) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        return budgets.run_within(budgets.Budget(), solve_input, puzzle_id, input_file)
+    except (MemoryError, RuntimeError) as e:
+        seconds = time.perf_counter() - start
+        return BatchResult(puzzle_id, str(input_file), None, seconds, repr(e))
+
+
+def solve_input(puzzle_id: int, input_file: Path) -> BatchResult:
+    """Solve both parts of a puzzle on one input file.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        input_file (Path): the input file.
+
+    Returns
+    -------
+        BatchResult: the answers, or the error that the solution failed with.
+    """
+    answers: list[Any] | None = None
+    error: str | None = None
+    start = time.perf_counter()
+
+    try:
+        module = utils.import_solution(puzzle_id)
+        if module is None:
+            raise ModuleNotFoundError(f"no solution for day {puzzle_id}")
+
+        answers = list(module.main(utils.PuzzleInput.from_file(input_file)))
+    except Exception as e:
+        error = repr(e)
+
+    seconds = time.perf_counter() - start
+    return BatchResult(puzzle_id, str(input_file), answers, seconds, error)
+
+
+def run_batch(inputs: list[tuple[int, Path]], jobs: int) -> Iterator[BatchResult]:
+    """Solve many inputs across worker processes.
+
+    A worker dying, e.g. when killed for running out of memory, breaks its pool,
+    failing every input still in it. The inputs that had been started are then
+    solved again in a subprocess each, so the one that killed the worker gets an
+    error of its own, and the rest go on in a fresh pool.
+
+    Args
+    ----
+        inputs (list[tuple[int, Path]]): the puzzle ID and path of each input.
+        jobs (int): the number of worker processes to use.
+
+    Yields
+    ------
+        Iterator[BatchResult]: the result for each input, as soon as it's ready.
+    """
+    puzzle_ids = sorted({puzzle_id for puzzle_id, _ in inputs})
+    pending = list(inputs)
+
+    while pending:
+        started = RawArray("b", len(pending))
+        broken: list[int] = []
+
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=warm_up, initargs=(puzzle_ids, started)
+        ) as executor:
+            futures = {
+                executor.submit(_solve_tracked, index, solve_input, *task): index
+                for index, task in enumerate(pending)
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    broken.append(futures[future])
+                    continue
+                yield result
+
+        # A worker that died warming up hadn't started on anything, so suspect them all
+        suspects = sorted(i for i in broken if started[i]) or sorted(broken)
+        with ThreadPoolExecutor(max_workers=jobs) as isolated:
+            alone = [isolated.submit(_solve_alone, *pending[i]) for i in suspects]
+            yield from (future.result() for future in as_completed(alone))
+
+        pending = [pending[i] for i in sorted(set(broken) - set(suspects))]
+
+
+def to_json(result: BatchResult) -> str:
+    """Format a result as a single line of JSON."""
+    return json.dumps(asdict(result))
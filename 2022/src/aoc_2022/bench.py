@@ -0,0 +1,268 @@
+import datetime
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from itertools import groupby, repeat
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Iterator
+
+from aoc_2022 import generators, utils
+from aoc_2022.utils import PartFn
+
+# Every run is appended as a line of its own, to track timings over time
+OUTPUT_FILE = Path("./bench.ndjson")
+BASELINE_FILE = Path("./bench_baseline.json")
+
+__all__ = [
+    "BenchResult",
+    "bench",
+    "bench_part",
+    "check_baseline",
+    "read_history",
+    "save_baseline",
+    "summarise",
+]
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    puzzle_id: int
+    part_number: int
+    scale: float | None
+    min: float
+    median: float
+    p95: float
+    stddev: float
+    runs: int
+
+    @property
+    def label(self) -> str:
+        scale = "" if self.scale is None else f" @ {self.scale:g}x"
+        return f"{self.puzzle_id:02}.{self.part_number}{scale}"
+
+
+def summarise(samples: list[float]) -> tuple[float, float, float, float]:
+    """Summarise a list of timings.
+
+    Args
+    ----
+        samples (list[float]): the timings, in seconds.
+
+    Returns
+    -------
+        tuple[float, float, float, float]: the min, median, 95th percentile and
+            standard deviation of the timings.
+    """
+    if len(samples) < 2:
+        return (samples[0], samples[0], samples[0], 0.0)
+
+    p95 = statistics.quantiles(samples, n=20, method="inclusive")[-1]
+    return (min(samples), statistics.median(samples), p95, statistics.stdev(samples))
+
+
+def time_part(part_fn: PartFn, lines: list[str]) -> float:
+    start = time.perf_counter()
+    part_fn(iter(lines))
+    return time.perf_counter() - start
+
+
+def bench_part(
+    part_fn: PartFn, lines: list[str], repeats: int, warmup: int
+) -> list[float]:
+    """Time repeated runs of one part of a solution over in-memory input.
+
+    Args
+    ----
+        part_fn (PartFn): the part of the solution to time.
+        lines (list[str]): the puzzle input lines.
+        repeats (int): the number of timed runs.
+        warmup (int): the number of untimed runs made beforehand.
+
+    Returns
+    -------
+        list[float]: the timing of each run, in seconds.
+    """
+    for _ in repeat(None, warmup):
+        part_fn(iter(lines))
+
+    return [time_part(part_fn, lines) for _ in repeat(None, repeats)]
+
+
+def read_lines(puzzle_id: int, scale: float | None) -> list[str] | None:
+    if scale is None:
+        return list(utils.fetch_input(puzzle_id))
+
+    if puzzle_id not in generators.GENERATORS:
+        return None
+    return list(generators.generate_lines(puzzle_id, scale))
+
+
+def bench_one(
+    puzzle_id: int,
+    part_numbers: list[int],
+    repeats: int,
+    warmup: int,
+    scale: float | None = None,
+) -> Iterator[BenchResult]:
+    module = utils.import_solution(puzzle_id)
+    if module is None:
+        return
+
+    # Read the input up-front so that only the solution itself is timed
+    lines = read_lines(puzzle_id, scale)
+    if lines is None:
+        return
+
+    for part_number in part_numbers:
+        part_fn = utils.get_part(module, part_number)
+        samples = bench_part(part_fn, lines, repeats, warmup)
+        yield BenchResult(
+            puzzle_id, part_number, scale, *summarise(samples), len(samples)
+        )
+
+
+def get_display(result: BenchResult) -> str:
+    return (
+        f"{result.label} -> "
+        f"min {result.min * 1000:9.3f}ms, median {result.median * 1000:9.3f}ms, "
+        f"p95 {result.p95 * 1000:9.3f}ms, stddev {result.stddev * 1000:9.3f}ms"
+    )
+
+
+def bench(
+    puzzle_id: int | None,
+    repeats: int,
+    warmup: int,
+    output: Path,
+    scales: list[float] | None = None,
+) -> list[BenchResult]:
+    """Benchmark one or all solutions, printing and saving the results.
+
+    Args
+    ----
+        puzzle_id (int | None): the puzzle ID (day number), or None for all days.
+        repeats (int): the number of timed runs per part.
+        warmup (int): the number of untimed runs per part.
+        output (Path): the NDJSON file to append the results to, as one
+            timestamped line.
+        scales (list[float] | None, optional): the sizes of generated input to run
+            on, relative to a typical puzzle input. Defaults to None, which runs on
+            the cached puzzle input instead.
+
+    Returns
+    -------
+        list[BenchResult]: the results for each part of each solution.
+    """
+    if repeats < 1:
+        raise ValueError("repeat must be >= 1")
+
+    puzzle_ids = range(1, 26) if puzzle_id is None else (puzzle_id,)
+    input_scales: list[float | None] = list(scales) if scales else [None]
+
+    results = []
+    solutions = groupby(utils.find_solutions(puzzle_ids), key=itemgetter(0))
+    for result_puzzle_id, parts in solutions:
+        part_numbers = list(map(itemgetter(1), parts))
+        for scale in input_scales:
+            for result in bench_one(
+                result_puzzle_id, part_numbers, repeats, warmup, scale
+            ):
+                print(get_display(result))
+                results.append(result)
+
+    append_report(results, output, repeat=repeats, warmup=warmup)
+    return results
+
+
+def make_report(results: list[BenchResult], **settings: Any) -> dict[str, Any]:
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        **settings,
+        "results": list(map(asdict, results)),
+    }
+
+
+def write_report(results: list[BenchResult], output: Path, **settings: Any) -> None:
+    with output.open(mode="w", encoding=utils.UTF8) as f:
+        json.dump(make_report(results, **settings), f, indent=2)
+
+
+def append_report(results: list[BenchResult], output: Path, **settings: Any) -> None:
+    with output.open(mode="a", encoding=utils.UTF8) as f:
+        f.write(json.dumps(make_report(results, **settings)) + "\n")
+
+
+def read_history(path: Path) -> list[dict[str, Any]]:
+    """Read every benchmark run appended to a results file.
+
+    Args
+    ----
+        path (Path): the NDJSON results file.
+
+    Returns
+    -------
+        list[dict[str, Any]]: each run's report, oldest first, with its timestamp,
+            settings and results.
+    """
+    with path.open(mode="r", encoding=utils.UTF8) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def read_report(path: Path) -> dict[str, BenchResult]:
+    with path.open(mode="r", encoding=utils.UTF8) as f:
+        report = json.load(f)
+
+    # Key by label rather than position, so that new or removed parts still match up
+    results = map(lambda r: BenchResult(**r), report["results"])
+    return {result.label: result for result in results}
+
+
+def save_baseline(results: list[BenchResult], path: Path = BASELINE_FILE) -> None:
+    """Save benchmark results as the baseline for later runs to be checked against.
+
+    Args
+    ----
+        results (list[BenchResult]): the benchmark results.
+        path (Path, optional): the baseline file. Defaults to BASELINE_FILE.
+    """
+    write_report(results, path)
+
+
+def check_baseline(
+    results: list[BenchResult], threshold: float, path: Path = BASELINE_FILE
+) -> bool:
+    """Check benchmark results against the baseline, printing each part's change.
+
+    Medians are compared, as they are the least sensitive to one-off noisy runs.
+    Parts that aren't in the baseline yet are reported but never fail the check.
+
+    Args
+    ----
+        results (list[BenchResult]): the benchmark results.
+        threshold (float): the largest allowed slowdown, e.g. 0.15 for 15% slower.
+        path (Path, optional): the baseline file. Defaults to BASELINE_FILE.
+
+    Returns
+    -------
+        bool: whether every part was within the threshold of its baseline.
+    """
+    baseline = read_report(path)
+
+    passed = True
+    for result in results:
+        if (baseline_result := baseline.get(result.label)) is None:
+            print(f"{result.label} -> new, no baseline to compare to")
+            continue
+
+        change = result.median / baseline_result.median - 1
+        regressed = change > threshold
+        passed = passed and not regressed
+
+        status = "REGRESSED" if regressed else "ok"
+        print(f"{result.label} -> {change:+8.1%} median, {status}")
+
+    return passed
@@ -0,0 +1,186 @@
+import os
+import resource
+import signal
+import tomllib
+from dataclasses import dataclass, field, replace
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any, Callable, TypeVar, cast
+
+from aoc_2022.utils import get_process_context
+
+BUDGETS_FILE = Path("./budgets.toml")
+MIB = 1 << 20
+
+T = TypeVar("T")
+
+__all__ = ["Budget", "Budgets", "read_budgets", "run_within"]
+
+
+@dataclass(frozen=True)
+class Budget:
+    seconds: float | None = None
+    # The limit is on each process's address space, so a day that starts processes of
+    # its own, as with --split-parts, can use this much in each of them
+    memory_mib: int | None = None
+
+
+@dataclass(frozen=True)
+class Budgets:
+    default: Budget = Budget()
+    days: dict[int, Budget] = field(default_factory=dict)
+
+    def for_day(self, puzzle_id: int) -> Budget:
+        """Get a day's budget, falling back on the default for any unset limits."""
+        day = self.days.get(puzzle_id, Budget())
+        return Budget(
+            seconds=day.seconds if day.seconds is not None else self.default.seconds,
+            memory_mib=(
+                day.memory_mib
+                if day.memory_mib is not None
+                else self.default.memory_mib
+            ),
+        )
+
+
+def read_budgets(
+    path: Path | None = None,
+    seconds: float | None = None,
+    memory_mib: int | None = None,
+) -> Budgets:
+    """Read the time and memory budgets for each day.
+
+    The budgets file is TOML, where the top-level limits apply to any day that
+    doesn't set its own, for example:
+
+        seconds = 10
+        memory_mib = 1024
+
+        [day_12]
+        seconds = 60
+
+    Args
+    ----
+        path (Path | None, optional): the budgets file. Defaults to None, for no file.
+        seconds (float | None, optional): overrides the default time limit. Defaults
+            to None.
+        memory_mib (int | None, optional): overrides the default memory limit.
+            Defaults to None.
+
+    Returns
+    -------
+        Budgets: the budgets.
+    """
+    raw: dict[str, Any] = {}
+    if path is not None:
+        with path.open(mode="rb") as f:
+            raw = tomllib.load(f)
+
+    days = {
+        int(key.removeprefix("day_")): Budget(**value)
+        for key, value in raw.items()
+        if key.startswith("day_")
+    }
+    default = Budget(raw.get("seconds"), raw.get("memory_mib"))
+
+    if seconds is not None:
+        default = replace(default, seconds=seconds)
+    if memory_mib is not None:
+        default = replace(default, memory_mib=memory_mib)
+
+    return Budgets(default, days)
+
+
+def _run_limited(
+    sender: Connection, memory_mib: int | None, fn: Callable[..., Any], *args: Any
+) -> None:
+    # Lead a new process group, so any processes started here can be killed with it
+    os.setsid()
+
+    if memory_mib is not None:
+        limit = memory_mib * MIB
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        sender.send((True, fn(*args)))
+    except Exception as e:
+        sender.send((False, e))
+
+
+def run_within(budget: Budget, fn: Callable[..., T], *args: Any) -> T:
+    """Call a function in a supervised subprocess, limiting its time and memory.
+
+    Args
+    ----
+        budget (Budget): the limits. The memory limit is on the address space of the
+            subprocess, so it has to leave room for the interpreter itself, and
+            applies to each process the function starts separately. The time limit
+            applies to them all, as they're killed along with the subprocess.
+        fn (Callable[..., T]): the function to call, which must be picklable, as must
+            its arguments and result.
+
+    Raises
+    ------
+        TimeoutError: if the function ran for longer than its budget.
+        MemoryError: if the function ran out of memory.
+        RuntimeError: if the subprocess died without sending a result back.
+
+    Returns
+    -------
+        T: the function's result.
+    """
+    # The runner supervises days from threads, so the subprocess mustn't be forked
+    context = get_process_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_limited, args=(sender, budget.memory_mib, fn, *args)
+    )
+
+    process.start()
+    sender.close()
+
+    with receiver:
+        try:
+            finished = receiver.poll(budget.seconds)
+        except BaseException:
+            # Its own group doesn't get the terminal's Ctrl-C, so stop it from here
+            _kill_group(process)
+            process.join()
+            raise
+
+        if not finished:
+            _kill_group(process)
+            process.join()
+            raise TimeoutError(f"went over the time budget of {budget.seconds:g}s")
+
+        try:
+            succeeded, value = receiver.recv()
+        except EOFError:
+            succeeded, value = False, None
+
+    process.join()
+
+    if value is None and not succeeded:
+        # Don't leave anything it started running on without it
+        _kill_group(process)
+        # Nothing was sent back, as when the kernel kills a process using too much
+        # memory
+        if process.exitcode == -signal.SIGKILL:
+            raise MemoryError("was killed, probably for running out of memory")
+        raise RuntimeError(f"died with exit code {process.exitcode}")
+    if isinstance(value, MemoryError) and budget.memory_mib is not None:
+        raise MemoryError(f"went over the memory budget of {budget.memory_mib} MiB")
+    if not succeeded:
+        raise value
+
+    return cast(T, value)
+
+
+def _kill_group(process: BaseProcess) -> None:
+    assert process.pid is not None, "the subprocess hasn't been started"
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # The subprocess hasn't made its group yet, or everything in it has exited
+        process.kill()
@@ -0,0 +1,77 @@
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Sequence
+
+# Only the standard library is imported here, so that the client starts quickly
+SOCKET_PATH = Path("./.aoc.sock")
+FORWARDED_ACTIONS = ("run", "bench")
+UTF8 = "utf-8"
+
+__all__ = ["FORWARDED_ACTIONS", "SOCKET_PATH", "forward"]
+
+
+def forward(argv: Sequence[str], socket_path: Path = SOCKET_PATH) -> int:
+    """Forward a command to the server, printing its output.
+
+    Args
+    ----
+        argv (Sequence[str]): the command line arguments, as given to `main`.
+        socket_path (Path, optional): the server's socket. Defaults to SOCKET_PATH.
+
+    Raises
+    ------
+        OSError: if no server is listening on the socket.
+
+    Returns
+    -------
+        int: the command's exit status, or 1 if the server's response is missing or
+            malformed.
+    """
+    request = {"argv": list(argv), "cwd": os.getcwd()}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        with sock.makefile(mode="rwb") as f:
+            f.write(json.dumps(request).encode(UTF8) + b"\n")
+            f.flush()
+            line = f.readline()
+
+    try:
+        response = json.loads(line)
+        stdout, stderr = str(response["stdout"]), str(response["stderr"])
+        status = int(response["status"])
+    except (ValueError, KeyError, TypeError):
+        print(f"Got a malformed response from the server: {line!r}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return status
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    socket_path = SOCKET_PATH
+    if len(argv) >= 2 and argv[0] == "--socket":
+        socket_path, argv = Path(argv[1]), argv[2:]
+
+    if not argv or argv[0] not in FORWARDED_ACTIONS:
+        actions = ",".join(FORWARDED_ACTIONS)
+        print(
+            f"usage: python -m aoc_2022.client [--socket PATH] {{{actions}}} ...",
+            file=sys.stderr,
+        )
+        return 2
+
+    try:
+        return forward(argv, socket_path)
+    except OSError as e:
+        print(f"Couldn't reach a server on {socket_path}: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,51 +1,34 @@
-from itertools import takewhile, tee
-from operator import attrgetter
+import heapq
+from itertools import takewhile
 from typing import Iterator
 
-from aoc_2022.iterutils import iter_len
+from aoc_2022.utils import PuzzleInput
 
 
-class Elf:
-    def __init__(self, carried_calories: Iterator[int]):
-        self._carried_calories = list(carried_calories)
-        self._total_calories = sum(self._carried_calories)
+def read_calories(lines: Iterator[str]) -> Iterator[int]:
+    """Generate the total calories carried by each elf, without keeping any items."""
 
-    @property
-    def carried_calories(self) -> list[int]:
-        return self._carried_calories
-
-    @property
-    def total_calories(self) -> int:
-        return self._total_calories
-
-    def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(carried_calories={self._carried_calories})"
-
-
-def read_calories(lines: Iterator[str]) -> Iterator[Elf]:
     def not_blank(line: str) -> bool:
         return line != ""
 
-    while True:
-        result = map(int, takewhile(not_blank, lines))
-        calories, calorie_len = iter_len(result)
-        if calorie_len == 0:
-            break
-        yield Elf(calories)
+    while (first := next(lines, None)) is not None:
+        # Any extra blank lines between elves are skipped, rather than read as elves
+        if not_blank(first):
+            yield int(first) + sum(map(int, takewhile(not_blank, lines)))
 
 
-def sort_calories(data: Iterator[str]) -> list[int]:
-    return sorted(map(attrgetter("total_calories"), read_calories(data)), reverse=True)
+def top_calories(data: Iterator[str], k: int) -> list[int]:
+    """Find the k largest totals, largest first, keeping only k totals in memory."""
+    return heapq.nlargest(k, read_calories(data))
 
 
 def part_1(data: Iterator[str]) -> int:
-    return sort_calories(data)[0]
+    return max(read_calories(data))
 
 
 def part_2(data: Iterator[str]) -> int:
-    return sum(sort_calories(data)[:3])
+    return sum(top_calories(data, 3))
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    return (part_1(iter(data)), part_2(iter(data)))
@@ -1,7 +1,8 @@
 from enum import Enum
-from itertools import tee
 from typing import Iterator
 
+from aoc_2022.utils import PuzzleInput
+
 RpsMove = Enum("RpsMove", "ROCK PAPER SCISSORS NONE")
 RpsOutcome = Enum("RpsOutcome", "WIN DRAW LOSS")
 
@@ -83,6 +84,5 @@ def part_2(data: Iterator[str]) -> int:
     return sum(map(score_round_part_2, data))
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    return (part_1(iter(data)), part_2(iter(data)))
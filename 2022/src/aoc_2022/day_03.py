@@ -1,9 +1,10 @@
 from functools import reduce
-from itertools import chain, tee
+from itertools import chain
 from string import ascii_letters
 from typing import Iterator
 
 from aoc_2022.iterutils import call_method, group_amounts, map_to_dict
+from aoc_2022.utils import PuzzleInput
 
 ITEM_PRIORITY = {letter: score for score, letter in enumerate(ascii_letters, 1)}
 
@@ -53,6 +54,5 @@ def part_2(data: Iterator[str]) -> int:
     )
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    return (part_1(iter(data)), part_2(iter(data)))
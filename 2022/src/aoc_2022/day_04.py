@@ -1,6 +1,9 @@
-from itertools import starmap, tee
+from itertools import starmap
 from typing import Iterator, NamedTuple
 
+from aoc_2022.iterutils import instrument
+from aoc_2022.utils import PuzzleInput
+
 
 class Range(NamedTuple):
     min: int
@@ -35,13 +38,16 @@ def are_ranges_overlapping(r1: Range, r2: Range) -> bool:
 
 
 def part_1(data: Iterator[str]) -> int:
-    return sum(starmap(are_ranges_coincident, map(parse_ranges, data)))
+    ranges = instrument("day_04.ranges", map(parse_ranges, data))
+    coincident = starmap(are_ranges_coincident, ranges)
+    return sum(instrument("day_04.coincident", coincident))
 
 
 def part_2(data: Iterator[str]) -> int:
-    return sum(starmap(are_ranges_overlapping, map(parse_ranges, data)))
+    ranges = instrument("day_04.ranges", map(parse_ranges, data))
+    overlapping = starmap(are_ranges_overlapping, ranges)
+    return sum(instrument("day_04.overlapping", overlapping))
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    return (part_1(iter(data)), part_2(iter(data)))
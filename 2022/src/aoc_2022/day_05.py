@@ -1,9 +1,10 @@
 import re
-from itertools import chain, repeat, starmap, tee
+from itertools import chain, repeat, starmap
 from operator import itemgetter
 from typing import Iterator
 
-from aoc_2022.iterutils import call_method, call_with, consume, ingest_while, iter_len
+from aoc_2022.iterutils import call_method, call_with, consume, ingest_while
+from aoc_2022.utils import PuzzleInput
 
 CRATE_LINE_PATTERN = re.compile(r"(\[[A-Z]\]|\s{3,3})\s?")
 CRATE_LETTER_PATTERN = re.compile(r"\[([A-Z])\]")
@@ -15,11 +16,11 @@ class CrateStacks:
         self._stacks: list[list[str]] = []
 
     def add_level(self, level: Iterator[str]) -> None:
-        if self._stacks == []:
-            level, level_len = iter_len(level)
-            self._stacks = list(map(call_with(), repeat(list, level_len)))
-
         for stack_number, crate in enumerate(level):
+            # Stacks are added as a level reaches them, so no level is measured first
+            if stack_number == len(self._stacks):
+                self._stacks.append([])
+
             if crate == " ":
                 continue
 
@@ -127,6 +128,5 @@ def part_2(data: Iterator[str]) -> str:
     return crate_stacks.get_top_crates()
 
 
-def main(data: Iterator[str]) -> tuple[str, str]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[str, str]:
+    return (part_1(iter(data)), part_2(iter(data)))
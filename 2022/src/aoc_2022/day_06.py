@@ -1,24 +1,16 @@
 from functools import partial
-from itertools import starmap, takewhile, tee
-from operator import gt, itemgetter
+from itertools import takewhile
+from operator import gt
 from typing import Iterator
 
-from .iterutils import call_with
-
-
-def ngram(s: str, n: int) -> Iterator[str]:
-    limits = zip(range(0, len(s)), range(n, len(s)))
-    slices = starmap(slice, limits)
-    slice_getters = map(itemgetter, slices)
-
-    return map(call_with(s), slice_getters)
+from .iterutils import DistinctCount, rolling
+from .utils import PuzzleInput
 
 
 def detect_marker(signal: str, marker_size: int) -> int:
-    marker_candidates = ngram(signal, marker_size)
+    distinct_counts = rolling(signal, marker_size, DistinctCount[str]())
     incorrect_marker_length = partial(gt, marker_size)
-    marker_lengths = map(len, (map(lambda x: set(x), marker_candidates)))
-    used_candidates = takewhile(incorrect_marker_length, marker_lengths)
+    used_candidates = takewhile(incorrect_marker_length, distinct_counts)
 
     return marker_size + sum(1 for _ in used_candidates)
 
@@ -39,6 +31,5 @@ def part_2(data: Iterator[str]) -> int:
     return detect_start_of_message_marker(next(data))
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    return (part_1(iter(data)), part_2(iter(data)))
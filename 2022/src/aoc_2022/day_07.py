@@ -1,10 +1,10 @@
 import enum
 from functools import partial
-from itertools import tee
 from operator import attrgetter, gt, itemgetter, lt
 from typing import Iterator, Optional
 
 from aoc_2022.iterutils import consume
+from aoc_2022.utils import PuzzleInput
 
 
 class Directory:
@@ -112,30 +112,30 @@ def parse_command(line: str) -> tuple[str, list[str]]:
     return (split[1], split[2:])
 
 
-def part_1(data: Iterator[str]) -> int:
-    size_limit = 100_000  # dir_size <= 100_000
-
+def parse(data: Iterator[str]) -> Directory:
     ingestor = Ingestor()
 
     consume(map(ingestor, data))
 
+    return ingestor._root
+
+
+def part_1(root: Directory) -> int:
+    size_limit = 100_000  # dir_size <= 100_000
+
     return sum(
         filter(
             partial(gt, size_limit),
-            map(attrgetter("total_recursive_size"), ingestor.directories),
+            map(attrgetter("total_recursive_size"), root.get_children_recursively()),
         )
     )
 
 
-def part_2(data: Iterator[str]) -> int:
+def part_2(root: Directory) -> int:
     total_free_space = 70_000_000
     required_available_space = 30_000_000
 
-    ingestor = Ingestor()
-
-    consume(map(ingestor, data))
-
-    total_used_space = ingestor._root.total_recursive_size
+    total_used_space = root.total_recursive_size
     total_available_space = total_free_space - total_used_space
 
     space_to_free = required_available_space - total_available_space
@@ -144,12 +144,15 @@ def part_2(data: Iterator[str]) -> int:
         min(
             filter(
                 partial(lt, space_to_free),
-                map(attrgetter("total_recursive_size"), ingestor.directories),
+                map(
+                    attrgetter("total_recursive_size"),
+                    root.get_children_recursively(),
+                ),
             )
         )
     )
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    root = parse(iter(data))
+    return (part_1(root), part_2(root))
@@ -1,3 +1,5 @@
+import struct
+from array import array
 from dataclasses import dataclass
 from functools import partial, reduce
 from itertools import (
@@ -10,12 +12,18 @@ from itertools import (
     repeat,
     starmap,
     takewhile,
-    tee,
 )
 from operator import add, gt, mul, ne, sub
-from typing import Iterator
+from typing import Iterator, Sequence
 
-from aoc_2022.iterutils import iter_len, transpose
+from aoc_2022.iterutils import CountingIterator, consume, instrument
+from aoc_2022.utils import PuzzleInput
+
+PARSER_VERSION = 2
+# Lines may be rows of digits straight from the input, or already read into heights
+TreeLine = Sequence[int] | str
+
+GRID_HEADER = struct.Struct("<II")
 
 
 @dataclass(frozen=True)
@@ -53,7 +61,7 @@ class Coord:
         return hash((self.row, self.col))
 
 
-def observe_visibility(tree_line: str) -> Iterator[int]:
+def observe_visibility(tree_line: TreeLine) -> Iterator[int]:
     cumulative_max_height = accumulate(map(int, tree_line), max)
     where_tree_height_changes = starmap(ne, pairwise(cumulative_max_height))
     # Because we are calculating where tree height changes, we need to start at the
@@ -63,14 +71,14 @@ def observe_visibility(tree_line: str) -> Iterator[int]:
     return chain((0,), compress(next_indices, where_tree_height_changes))
 
 
-def observe_visibility_in_reverse(tree_line: str) -> Iterator[int]:
+def observe_visibility_in_reverse(tree_line: TreeLine) -> Iterator[int]:
     max_index = len(tree_line) - 1
     return map(partial(sub, max_index), observe_visibility(tree_line[::-1]))
 
 
 def observe_row_visibility(
-    row_number: int, tree_row: str
-) -> tuple[Iterator[tuple[int, int]], str]:
+    row_number: int, tree_row: TreeLine
+) -> tuple[Iterator[tuple[int, int]], TreeLine]:
     trees_visible_in_row = chain(
         observe_visibility(tree_row), observe_visibility_in_reverse(tree_row)
     )
@@ -79,7 +87,7 @@ def observe_row_visibility(
 
 
 def observe_column_visibility(
-    column_number: int, tree_column: str
+    column_number: int, tree_column: TreeLine
 ) -> Iterator[tuple[int, int]]:
     trees_visible_in_column = chain(
         observe_visibility(tree_column), observe_visibility_in_reverse(tree_column)
@@ -91,17 +99,11 @@ def observe_column_visibility(
 def count_visible(current_height: int, tree_line: Iterator[int]) -> int:
     """Count the number of visible trees along a tree line."""
     tree_is_visible = partial(gt, current_height)
-    tree_line, tree_line_len = iter_len(tree_line)
-    if tree_line_len == 0:
-        return 0
-    total_visible_trees = sum(1 for _ in takewhile(tree_is_visible, tree_line))
-
-    if total_visible_trees < tree_line_len:
-        # If we didn't reach the end of the line, we have to add one as we can see
-        # the tree we're being blocked by
-        return total_visible_trees + 1
-
-    return total_visible_trees
+    # takewhile pulls the tree we're being blocked by too, and we can see that one,
+    # so every tree pulled is visible
+    seen = CountingIterator(tree_line)
+    consume(takewhile(tree_is_visible, seen))
+    return seen.count
 
 
 def get_at_grid(tree_grid: list[list[int]], coord: Coord) -> int:
@@ -137,13 +139,39 @@ def generate_visible_tree_lines(
     return (map(height_at, seen_line(d)) for d in directions)
 
 
-def part_1(data: Iterator[str]) -> int:
-    row_visibilities_iter, piped_data = transpose(
-        starmap(observe_row_visibility, enumerate(data))
+def read_grid(data: Iterator[str]) -> list[list[int]]:
+    def read_row(row: str) -> list[int]:
+        return list(map(int, row))
+
+    return list(map(read_row, data))
+
+
+def parse(data: Iterator[str]) -> list[list[int]]:
+    return read_grid(data)
+
+
+def pack(tree_grid: list[list[int]]) -> bytes:
+    """Pack the grid's size, then one byte per tree height, row by row."""
+    rows = len(tree_grid)
+    cols = len(tree_grid[0]) if tree_grid else 0
+    header = GRID_HEADER.pack(rows, cols)
+    return header + array("B", chain.from_iterable(tree_grid)).tobytes()
+
+
+def unpack(buffer: memoryview) -> list[list[int]]:
+    """Unpack a grid packed by `pack`."""
+    rows, cols = GRID_HEADER.unpack_from(buffer)
+    heights = buffer[GRID_HEADER.size :].tolist()
+    return [heights[row * cols : (row + 1) * cols] for row in range(rows)]
+
+
+def part_1(tree_grid: list[list[int]]) -> int:
+    row_visibilities = chain.from_iterable(
+        coords for coords, _ in starmap(observe_row_visibility, enumerate(tree_grid))
     )
-    columns = map("".join, transpose(piped_data))
+    # The grid is already in memory, so its columns can be read straight off it
+    columns = zip(*tree_grid)
 
-    row_visibilities = chain.from_iterable(row_visibilities_iter)
     column_visibilities = chain.from_iterable(
         starmap(observe_column_visibility, enumerate(columns))
     )
@@ -153,18 +181,14 @@ def part_1(data: Iterator[str]) -> int:
     return len(all_visible_trees)
 
 
-def part_2(data: Iterator[str]) -> int:
-    def read_row(row: str) -> list[int]:
-        return list(map(int, row))
-
-    tree_grid = list(map(read_row, data))
+def part_2(tree_grid: list[list[int]]) -> int:
     grid_size = len(tree_grid)
     get_scores_from = partial(get_score_at, tree_grid)
     all_coords = starmap(Coord, product(range(grid_size), repeat=2))
 
-    return max(map(get_scores_from, all_coords))
+    return max(instrument("day_08.scores", map(get_scores_from, all_coords)))
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    tree_grid = parse(iter(data))
+    return (part_1(tree_grid), part_2(tree_grid))
@@ -1,8 +1,9 @@
-from itertools import chain, repeat, tee
+from itertools import chain, repeat
 from typing import Iterator
 
 from aoc_2022.day_08 import Coord
 from aoc_2022.iterutils import call_with, consume
+from aoc_2022.utils import PuzzleInput
 
 DIRECTION_MAP = {
     "U": Coord(1, 0),
@@ -62,6 +63,5 @@ def part_2(data: Iterator[str]) -> int:
     return len(longer_rope.visited_spaces)
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    return (part_1(iter(data)), part_2(iter(data)))
@@ -1,9 +1,10 @@
 from functools import partial
-from itertools import accumulate, chain, islice, pairwise, repeat, starmap, tee
+from itertools import accumulate, chain, islice, pairwise, repeat, starmap
 from operator import mul
 from typing import Callable, Iterator
 
 from aoc_2022.iterutils import call_with
+from aoc_2022.utils import PuzzleInput
 
 Instruction = Callable[[int], int]
 
@@ -82,6 +83,5 @@ def part_2(data: Iterator[str]) -> str:
     return "\n".join(screen)
 
 
-def main(data: Iterator[str]) -> tuple[int, str]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, str]:
+    return (part_1(iter(data)), part_2(iter(data)))
@@ -1,12 +1,20 @@
 import re
+import struct
+from array import array
+from copy import deepcopy
 from functools import partial, reduce
-from itertools import repeat, takewhile, tee
+from itertools import repeat, takewhile
 from operator import add, attrgetter, mul, truth
 from typing import Any, Callable, Iterator, NamedTuple, Optional, Type
 
 from aoc_2022.iterutils import call_with, consume
+from aoc_2022.utils import PuzzleInput
 
 OPERATIONS = {"+": add, "*": mul}
+PARSER_VERSION = 1
+# ID, operation symbol and operand (-1 for "old"), divisor, both monkeys thrown to,
+# then the number of items, whose worry levels follow the record
+MONKEY_RECORD = struct.Struct("<IcqIIII")
 
 
 class InputMap(NamedTuple):
@@ -18,17 +26,30 @@ def read_list(match: str) -> list[int]:
     return list(map(int, match.split(", ")))
 
 
-def read_op(match: str) -> Callable[[int], int]:
+class Operation(NamedTuple):
+    symbol: str
+    # None stands for the old value itself, as in "old * old"
+    operand: int | None
+
+
+def read_op(match: str) -> Operation:
     _, new_value = match.split(" = ", maxsplit=2)
     arg1, op_str, arg2 = new_value.split(" ", maxsplit=3)
 
     assert arg1 == "old"
-    op: Callable[[int, int], int] = OPERATIONS[op_str]
+    assert op_str in OPERATIONS
     if arg2 == "old":
         operand = None
     else:
         operand = int(arg2)
 
+    return Operation(op_str, operand)
+
+
+def make_op(operation: Operation) -> Callable[[int], int]:
+    op: Callable[[int, int], int] = OPERATIONS[operation.symbol]
+    operand = operation.operand
+
     def op_fn(value: int) -> int:
         return op(value, operand if operand is not None else value)
 
@@ -40,7 +61,7 @@ INPUT_MAPPINGS: dict[str, InputMap] = {
     "item_worry_levels": InputMap(
         re.compile(r"\s+Starting items: ([\d, ]+)"), read_list
     ),
-    "worry_level_op": InputMap(re.compile(r"\s+Operation: (.+)"), read_op),
+    "operation": InputMap(re.compile(r"\s+Operation: (.+)"), read_op),
     "modulo_value": InputMap(re.compile(r"\s+Test: divisible by (\d+)"), int),
     "throw_to_if_true": InputMap(re.compile(r"\s+If true: throw to monkey (\d+)"), int),
     "throw_to_if_false": InputMap(
@@ -53,6 +74,7 @@ class Monkey:
     def __init__(self) -> None:
         self.mid = -1
         self.item_worry_levels: list[int] = []
+        self.operation = Operation("+", 0)
         self.worry_level_op: Callable[[int], int] = lambda x: x
         self.modulo_value = -1
         self.throw_to_if_true = -1
@@ -72,6 +94,7 @@ class Monkey:
         if monkey.mid == -1:
             return None
 
+        monkey.worry_level_op = make_op(monkey.operation)
         return monkey
 
     def inspect_item(self, item_worry_level: int) -> int:
@@ -125,8 +148,63 @@ def compute_round(relieve: Callable[[int], int], monkeys: list[Monkey]) -> None:
         take_turn(relieve, monkey, monkeys)
 
 
-def part_1(data: Iterator[str]) -> int:
-    monkeys = read_monkeys(data)
+def parse(data: Iterator[str]) -> list[Monkey]:
+    return read_monkeys(data)
+
+
+def pack(monkeys: list[Monkey]) -> bytes:
+    """Pack the monkeys as fixed-size records, each followed by its items."""
+    packed = bytearray()
+    for monkey in monkeys:
+        symbol, operand = monkey.operation
+        packed += MONKEY_RECORD.pack(
+            monkey.mid,
+            symbol.encode(),
+            -1 if operand is None else operand,
+            monkey.modulo_value,
+            monkey.throw_to_if_true,
+            monkey.throw_to_if_false,
+            len(monkey.item_worry_levels),
+        )
+        packed += array("q", monkey.item_worry_levels).tobytes()
+
+    return bytes(packed)
+
+
+def unpack(buffer: memoryview) -> list[Monkey]:
+    """Unpack monkeys packed by `pack`."""
+    monkeys = []
+    offset = 0
+    while offset < len(buffer):
+        monkey = Monkey()
+        (
+            monkey.mid,
+            symbol,
+            operand,
+            monkey.modulo_value,
+            monkey.throw_to_if_true,
+            monkey.throw_to_if_false,
+            num_items,
+        ) = MONKEY_RECORD.unpack_from(buffer, offset)
+        offset += MONKEY_RECORD.size
+
+        items = array("q")
+        items.frombytes(buffer[offset : offset + num_items * items.itemsize])
+        offset += num_items * items.itemsize
+
+        monkey.item_worry_levels = items.tolist()
+        monkey.operation = Operation(
+            symbol.decode(), None if operand == -1 else operand
+        )
+        monkey.worry_level_op = make_op(monkey.operation)
+        monkeys.append(monkey)
+
+    return monkeys
+
+
+def part_1(parsed_monkeys: list[Monkey]) -> int:
+    # The monkeys are shared between both parts, so play the rounds on a copy
+    monkeys = deepcopy(parsed_monkeys)
 
     def relieve(level: int) -> int:
         return level // 3
@@ -141,8 +219,8 @@ def part_1(data: Iterator[str]) -> int:
     return reduce(mul, most_inspected_monkeys[:2], 1)
 
 
-def part_2(data: Iterator[str]) -> int:
-    monkeys = read_monkeys(data)
+def part_2(parsed_monkeys: list[Monkey]) -> int:
+    monkeys = deepcopy(parsed_monkeys)
     total_modulo: int = reduce(mul, map(attrgetter("modulo_value"), monkeys))
 
     def relieve(level: int) -> int:
@@ -158,6 +236,6 @@ def part_2(data: Iterator[str]) -> int:
     return reduce(mul, most_inspected_monkeys[:2], 1)
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    monkeys = parse(iter(data))
+    return (part_1(monkeys), part_2(monkeys))
@@ -1,15 +1,24 @@
+import struct
+from array import array
 from collections import defaultdict
 from dataclasses import dataclass, field
 from functools import partial
-from itertools import product, starmap, tee
+from itertools import product, starmap
+from operator import attrgetter
 from queue import PriorityQueue
 from string import ascii_lowercase
-from typing import Callable, Iterator, TypeVar
+from typing import Callable, Iterator, NamedTuple, TypeVar
 
 from aoc_2022.iterutils import map_to_dict
+from aoc_2022.utils import PuzzleInput
 
 START_HEIGHT = -1
 END_HEIGHT = len(ascii_lowercase)
+PARSER_VERSION = 1
+# Rows, columns, then the indices of the start and end nodes
+GRAPH_HEADER = struct.Struct("<HHII")
+# Each bit of a node's packed neighbour mask stands for one of these offsets
+NEIGHBOUR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
 T = TypeVar("T")
 
 
@@ -42,6 +51,12 @@ class Node:
         )
 
 
+class HeightGraph(NamedTuple):
+    nodes: list[Node]
+    start: Node
+    end: Node
+
+
 @dataclass(order=True)
 class PrioritisedNode:
     f_scores: int
@@ -156,21 +171,67 @@ def A_star(start: Node, end: Node, h: Callable[[Node], int]) -> list[Node]:
     return []
 
 
-def part_1(data: Iterator[str]) -> int:
+def parse(data: Iterator[str]) -> HeightGraph:
     heightmap = read_heightmap(data)
     nodes = create_nodes(heightmap)
     start_node, end_node = find_start_and_end(nodes)
-    heuristic = end_node.distance_to
+    return HeightGraph(nodes, start_node, end_node)
+
+
+def pack(graph: HeightGraph) -> bytes:
+    """Pack the graph as the height of each node, then a bitmask of its neighbours."""
+    cols: int = max(map(attrgetter("col"), graph.nodes)) + 1
+    rows = len(graph.nodes) // cols
+
+    def index_of(node: Node) -> int:
+        return node.row * cols + node.col
+
+    def neighbour_mask(node: Node) -> int:
+        offsets = {(n.row - node.row, n.col - node.col) for n in node.neighbours}
+        return sum(
+            1 << bit
+            for bit, offset in enumerate(NEIGHBOUR_OFFSETS)
+            if offset in offsets
+        )
+
+    header = GRAPH_HEADER.pack(rows, cols, index_of(graph.start), index_of(graph.end))
+    heights = array("b", map(attrgetter("height"), graph.nodes))
+    masks = bytes(map(neighbour_mask, graph.nodes))
+    return header + heights.tobytes() + masks
+
 
-    path = A_star(start_node, end_node, heuristic)
+def unpack(buffer: memoryview) -> HeightGraph:
+    """Unpack a graph packed by `pack`."""
+    rows, cols, start, end = GRAPH_HEADER.unpack_from(buffer)
+    heights_start = GRAPH_HEADER.size
+    masks_start = heights_start + rows * cols
+
+    heights = array("b")
+    heights.frombytes(buffer[heights_start:masks_start])
+    coords = product(range(rows), range(cols))
+    nodes = [Node(row, col, height) for (row, col), height in zip(coords, heights)]
+
+    # Linking straight from the masks skips checking whether each step is climbable
+    for node, mask in zip(nodes, buffer[masks_start:]):
+        node.neighbours = {
+            nodes[(node.row + d_row) * cols + node.col + d_col]
+            for bit, (d_row, d_col) in enumerate(NEIGHBOUR_OFFSETS)
+            if mask & (1 << bit)
+        }
+
+    return HeightGraph(nodes, nodes[start], nodes[end])
+
+
+def part_1(graph: HeightGraph) -> int:
+    heuristic = graph.end.distance_to
+
+    path = A_star(graph.start, graph.end, heuristic)
     return len(path) - 1
 
 
-def part_2(data: Iterator[str]) -> int:
-    heightmap = read_heightmap(data)
-    nodes = create_nodes(heightmap)
-    _, end_node = find_start_and_end(nodes)
-    start_nodes = filter(lambda x: x.height == 0, nodes)
+def part_2(graph: HeightGraph) -> int:
+    end_node = graph.end
+    start_nodes = filter(lambda x: x.height == 0, graph.nodes)
 
     possible_paths = filter(
         None, map(lambda x: A_star(x, end_node, end_node.distance_to), start_nodes)
@@ -178,6 +239,6 @@ def part_2(data: Iterator[str]) -> int:
     return min(map(len, possible_paths)) - 1
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    graph = parse(iter(data))
+    return (part_1(graph), part_2(graph))
@@ -1,6 +1,7 @@
-from itertools import tee
 from typing import Iterator
 
+from aoc_2022.utils import PuzzleInput
+
 
 def part_1(data: Iterator[str]) -> int:
     pass
@@ -10,6 +11,5 @@ def part_2(data: Iterator[str]) -> int:
     pass
 
 
-def main(data: Iterator[str]) -> tuple[int, int]:
-    data_1, data_2 = tee(data)
-    return (part_1(data_1), part_2(data_2))
+def main(data: PuzzleInput) -> tuple[int, int]:
+    return (part_1(iter(data)), part_2(iter(data)))
@@ -0,0 +1,228 @@
+import math
+import random
+from itertools import chain
+from string import ascii_letters, ascii_lowercase, ascii_uppercase
+from typing import Callable, Iterator
+
+Generator = Callable[[float, random.Random], Iterator[str]]
+
+__all__ = ["GENERATORS", "generate_lines"]
+
+
+def scaled(base_size: int, scale: float) -> int:
+    return max(1, round(base_size * scale))
+
+
+def scaled_side(base_side: int, scale: float) -> int:
+    # Grids scale by their number of cells, so each side grows with the square root
+    return max(1, round(base_side * math.sqrt(scale)))
+
+
+def generate_day_01(scale: float, rng: random.Random) -> Iterator[str]:
+    for elf in range(scaled(250, scale)):
+        if elf > 0:
+            yield ""
+        for _ in range(rng.randint(1, 15)):
+            yield str(rng.randint(1_000, 60_000))
+
+
+def generate_day_02(scale: float, rng: random.Random) -> Iterator[str]:
+    for _ in range(scaled(2_500, scale)):
+        yield f"{rng.choice('ABC')} {rng.choice('XYZ')}"
+
+
+def generate_day_03(scale: float, rng: random.Random) -> Iterator[str]:
+    for _ in range(scaled(100, scale)):
+        # Each elf in a group packs from its own letters, so the badge is the only
+        # item type that all three have in common
+        letters = list(ascii_letters)
+        rng.shuffle(letters)
+        badge, pools = letters[0], (letters[1:18], letters[18:35], letters[35:52])
+
+        for pool in pools:
+            compartment_size = rng.randint(8, 16)
+            first_half = rng.choices(pool, k=compartment_size - 1)
+            second_half = rng.choices(pool, k=compartment_size - 1)
+            first_half.append(rng.choice(first_half + second_half))
+            second_half.append(badge)
+            yield "".join(first_half + second_half)
+
+
+def generate_day_04(scale: float, rng: random.Random) -> Iterator[str]:
+    def make_range() -> str:
+        lower = rng.randint(1, 99)
+        return f"{lower}-{rng.randint(lower, 99)}"
+
+    for _ in range(scaled(1_000, scale)):
+        yield f"{make_range()},{make_range()}"
+
+
+def generate_day_05(scale: float, rng: random.Random) -> Iterator[str]:
+    num_stacks = 9
+    stacks = [
+        rng.choices(ascii_uppercase, k=rng.randint(1, 8)) for _ in range(num_stacks)
+    ]
+
+    for level in reversed(range(max(map(len, stacks)))):
+        yield " ".join(
+            f"[{stack[level]}]" if level < len(stack) else "   " for stack in stacks
+        )
+    yield " ".join(f" {i + 1} " for i in range(num_stacks))
+    yield ""
+
+    for _ in range(scaled(500, scale)):
+        # Always leave a crate behind, so that every stack has a top crate at the end
+        from_stack = rng.choice([i for i, s in enumerate(stacks) if len(s) > 1])
+        to_stack = rng.choice([i for i in range(num_stacks) if i != from_stack])
+        amount = rng.randint(1, len(stacks[from_stack]) - 1)
+
+        moved = stacks[from_stack][-amount:]
+        del stacks[from_stack][-amount:]
+        stacks[to_stack].extend(moved)
+
+        yield f"move {amount} from {from_stack + 1} to {to_stack + 1}"
+
+
+def generate_day_06(scale: float, rng: random.Random) -> Iterator[str]:
+    # Only three letters are used until the very end, so no marker appears early
+    noise = rng.choices("abc", k=scaled(4_000, scale))
+    marker = rng.sample(ascii_lowercase, k=14)
+    yield "".join(chain(noise, marker))
+
+
+def generate_day_07(scale: float, rng: random.Random) -> Iterator[str]:
+    num_directories = scaled(200, scale)
+    num_files = scaled(1_000, scale)
+
+    children: list[list[int]] = [[] for _ in range(num_directories)]
+    for directory in range(1, num_directories):
+        children[rng.randrange(directory)].append(directory)
+
+    # Fill the disk to between the 40M and 70M part 2 needs, whatever the file count
+    weights = [rng.random() for _ in range(num_files)]
+    size_per_weight = 55_000_000 / sum(weights)
+
+    files: list[list[int]] = [[] for _ in range(num_directories)]
+    for weight in weights:
+        size = max(1, int(weight * size_per_weight))
+        files[rng.randrange(num_directories)].append(size)
+
+    def explore(directory: int) -> Iterator[str]:
+        yield "$ ls"
+        yield from (f"dir d{child}" for child in children[directory])
+        yield from (f"{size} f{i}.txt" for i, size in enumerate(files[directory]))
+        for child in children[directory]:
+            yield f"$ cd d{child}"
+            yield from explore(child)
+            yield "$ cd .."
+
+    yield "$ cd /"
+    yield from explore(0)
+
+
+def generate_day_08(scale: float, rng: random.Random) -> Iterator[str]:
+    side = scaled_side(99, scale)
+    for _ in range(side):
+        yield "".join(rng.choices("0123456789", k=side))
+
+
+def generate_day_09(scale: float, rng: random.Random) -> Iterator[str]:
+    for _ in range(scaled(2_000, scale)):
+        yield f"{rng.choice('UDLR')} {rng.randint(1, 20)}"
+
+
+def generate_day_10(scale: float, rng: random.Random) -> Iterator[str]:
+    num_instructions = scaled(150, scale)
+    # Part 2 draws a pixel each cycle, so the program must run for at least 240 cycles
+    cycles = 0
+    while num_instructions > 0 or cycles < 240:
+        num_instructions -= 1
+        if rng.random() < 0.3:
+            cycles += 1
+            yield "noop"
+        else:
+            cycles += 2
+            yield f"addx {rng.randint(-20, 20)}"
+
+
+def generate_day_11(scale: float, rng: random.Random) -> Iterator[str]:
+    num_monkeys = max(3, scaled(8, scale))
+    primes = (2, 3, 5, 7, 11, 13, 17, 19, 23)
+    # Only one monkey squares and nobody throws to it, otherwise items keep coming back
+    # to be squared and part 1's unrelieved worry levels grow without bound
+    squaring_monkey = rng.randrange(num_monkeys)
+
+    for mid in range(num_monkeys):
+        items = ", ".join(map(str, rng.choices(range(50, 100), k=rng.randint(1, 6))))
+        if mid == squaring_monkey:
+            operation = "old * old"
+        else:
+            operation = rng.choice(["old * {}", "old + {}"]).format(rng.randint(1, 9))
+        others = [i for i in range(num_monkeys) if i not in (mid, squaring_monkey)]
+
+        if mid > 0:
+            yield ""
+        yield f"Monkey {mid}:"
+        yield f"  Starting items: {items}"
+        yield f"  Operation: new = {operation}"
+        yield f"  Test: divisible by {rng.choice(primes)}"
+        yield f"    If true: throw to monkey {rng.choice(others)}"
+        yield f"    If false: throw to monkey {rng.choice(others)}"
+
+
+def generate_day_12(scale: float, rng: random.Random) -> Iterator[str]:
+    rows = scaled_side(41, scale)
+    cols = max(40, scaled_side(162, scale))
+    path_row = rng.randrange(rows)
+
+    for row in range(rows):
+        # Heights climb by at most one per column, with random dips that may only be
+        # climbed out of sideways. The path row has no dips, so E is always reachable
+        line = []
+        for col in range(cols):
+            height = col * len(ascii_lowercase) // cols
+            if row != path_row and rng.random() < 0.2:
+                height = rng.randint(0, height)
+            line.append(ascii_lowercase[height])
+
+        if row == path_row:
+            line[0], line[-1] = "S", "E"
+        yield "".join(line)
+
+
+GENERATORS: dict[int, Generator] = {
+    1: generate_day_01,
+    2: generate_day_02,
+    3: generate_day_03,
+    4: generate_day_04,
+    5: generate_day_05,
+    6: generate_day_06,
+    7: generate_day_07,
+    8: generate_day_08,
+    9: generate_day_09,
+    10: generate_day_10,
+    11: generate_day_11,
+    12: generate_day_12,
+}
+
+
+def generate_lines(puzzle_id: int, scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """Generate a synthetic puzzle input, for testing how solutions scale.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        scale (float, optional): the amount of input relative to a typical puzzle
+            input, e.g. 10 for ten times as many lines, or grid cells. Defaults to 1.
+        seed (int, optional): the random seed. Defaults to 0.
+
+    Raises
+    ------
+        KeyError: if there is no generator for the puzzle.
+
+    Returns
+    -------
+        Iterator[str]: an iterator of the input lines.
+    """
+    generator = GENERATORS[puzzle_id]
+    return generator(scale, random.Random(seed))
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import mmap
+import os
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# utils imports this module too, so only its attributes are used, once both are loaded
+from aoc_2022 import utils
+
+STORE_DIR = Path("./input/store/")
+INDEX_FILE_NAME = "index.json"
+BLOBS_FILE_NAME = "inputs.gz"
+# Each blob is a gzip member, so the blobs file as a whole is also a valid gzip file
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+__all__ = [
+    "MissingInputError",
+    "StoreEntry",
+    "add_input",
+    "get_key",
+    "iter_input",
+    "load_input",
+    "read_index",
+]
+
+
+@dataclass(frozen=True)
+class StoreEntry:
+    # Where the compressed blob is in the blobs file, and how long it is
+    offset: int
+    length: int
+    # The size and SHA-256 of the decompressed input
+    size: int
+    checksum: str
+
+
+class MissingInputError(KeyError):
+    def __str__(self) -> str:
+        # KeyError quotes its message as if it were a key
+        return str(self.args[0])
+
+
+def get_key(puzzle_id: int, input_id: str) -> str:
+    """Get the key an input is indexed under, e.g. "01/default"."""
+    return f"{puzzle_id:02}/{input_id}"
+
+
+def _get_entry(puzzle_id: int, input_id: str) -> StoreEntry:
+    index = read_index()
+    if (entry := index.get(get_key(puzzle_id, input_id))) is not None:
+        return entry
+
+    prefix = get_key(puzzle_id, "")
+    stored = sorted(key.removeprefix(prefix) for key in index if key.startswith(prefix))
+    raise MissingInputError(
+        f"no input {input_id!r} for day {puzzle_id:02} in the store, which has "
+        + (", ".join(map(repr, stored)) if stored else "none for that day")
+    )
+
+
+def _index_file() -> Path:
+    return STORE_DIR.joinpath(INDEX_FILE_NAME)
+
+
+def _blobs_file() -> Path:
+    return STORE_DIR.joinpath(BLOBS_FILE_NAME)
+
+
+def read_index() -> dict[str, StoreEntry]:
+    """Read the index of the input store.
+
+    Returns
+    -------
+        dict[str, StoreEntry]: the stored inputs, keyed by day and input ID, such as
+            "01/default". Empty if nothing has been stored yet.
+    """
+    try:
+        with _index_file().open(mode="r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+
+    return {key: StoreEntry(**entry) for key, entry in raw.items()}
+
+
+def _write_index(index: dict[str, StoreEntry]) -> None:
+    # Replace the index in one go, so that it never refers to a half-written blob
+    raw = {key: asdict(entry) for key, entry in sorted(index.items())}
+    utils.write_atomically([json.dumps(raw).encode("utf-8")], _index_file())
+
+
+def add_input(puzzle_id: int, input_id: str, chunks: Iterable[bytes]) -> StoreEntry:
+    """Compress an input into the store, replacing any input stored under its ID.
+
+    Blobs are only ever appended, so a replaced input's blob is left behind unused.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        input_id (str): a name for the input, e.g. an account or a stress test.
+        chunks (Iterable[bytes]): the input, a chunk at a time.
+
+    Returns
+    -------
+        StoreEntry: the index entry for the stored input.
+    """
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    checksum = hashlib.sha256()
+    size = 0
+
+    with _blobs_file().open(mode="ab") as f:
+        offset = f.seek(0, os.SEEK_END)
+        for chunk in chunks:
+            checksum.update(chunk)
+            size += len(chunk)
+            f.write(compressor.compress(chunk))
+        f.write(compressor.flush())
+        f.flush()
+        os.fsync(f.fileno())
+        length = f.tell() - offset
+
+    entry = StoreEntry(offset, length, size, checksum.hexdigest())
+    index = read_index()
+    index[get_key(puzzle_id, input_id)] = entry
+    _write_index(index)
+
+    return entry
+
+
+def _iter_compressed(entry: StoreEntry) -> Iterator[bytes]:
+    with _blobs_file().open(mode="rb") as f:
+        f.seek(entry.offset)
+        remaining = entry.length
+        while remaining > 0 and (block := f.read(min(utils.CHUNK_SIZE, remaining))):
+            remaining -= len(block)
+            yield block
+
+
+def _iter_entry(key: str, entry: StoreEntry) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    checksum = hashlib.sha256()
+    size = 0
+
+    try:
+        for block in _iter_compressed(entry):
+            chunk = decompressor.decompress(block)
+            checksum.update(chunk)
+            size += len(chunk)
+            # Stop early on a blob that inflates to more than it should
+            if size > entry.size:
+                break
+            yield chunk
+    except zlib.error as e:
+        raise ValueError(f"stored input {key} is corrupt: {e}") from e
+
+    if (
+        not decompressor.eof
+        or decompressor.unused_data
+        or size != entry.size
+        or checksum.hexdigest() != entry.checksum
+    ):
+        raise ValueError(f"stored input {key} is corrupt")
+
+
+def iter_input(puzzle_id: int, input_id: str) -> Iterator[bytes]:
+    """Stream an input out of the store, decompressing it a chunk at a time.
+
+    The input is only checked once it has been read to the end, so a consumer must
+    read it all before trusting any of it.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        input_id (str): the name the input was stored under.
+
+    Raises
+    ------
+        MissingInputError: if there is no such input in the store.
+        ValueError: if the stored input is corrupt.
+
+    Yields
+    ------
+        Iterator[bytes]: the decompressed input, a chunk at a time.
+    """
+    return _iter_entry(get_key(puzzle_id, input_id), _get_entry(puzzle_id, input_id))
+
+
+def load_input(puzzle_id: int, input_id: str) -> bytes | mmap.mmap:
+    """Load an input from the store, checking that it isn't corrupt.
+
+    Inputs are decompressed into anonymous memory maps rather than joined into one
+    bytes object, so large inputs are never held in memory twice over.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        input_id (str): the name the input was stored under.
+
+    Raises
+    ------
+        MissingInputError: if there is no such input in the store.
+        ValueError: if the stored input is corrupt.
+
+    Returns
+    -------
+        bytes | mmap.mmap: the whole input.
+    """
+    entry = _get_entry(puzzle_id, input_id)
+    chunks = _iter_entry(get_key(puzzle_id, input_id), entry)
+
+    if entry.size == 0:
+        return b"".join(chunks)
+
+    buffer = mmap.mmap(-1, entry.size)
+    for chunk in chunks:
+        buffer.write(chunk)
+    buffer.seek(0)
+
+    return buffer
@@ -1,11 +1,44 @@
+import time
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
 from functools import partial
-from itertools import chain, islice, tee
+from itertools import islice, starmap
 from operator import getitem, methodcaller
-from typing import Any, Callable, Iterable, Iterator, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    Protocol,
+    Sequence,
+    Sized,
+    TypeVar,
+)
 
 S = TypeVar("S")
 T = TypeVar("T")
+H = TypeVar("H", bound=Hashable)
+T_contra = TypeVar("T_contra", contravariant=True)
+R_co = TypeVar("R_co", covariant=True)
+
+
+@dataclass
+class StageStats:
+    items: int = 0
+    seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+# Stats for each named pipeline stage, only whilst instrumentation is enabled
+_stages: dict[str, StageStats] | None = None
 
 
 def group_amounts(iterator: Iterator[T], n: int) -> Iterator[Iterator[T]]:
@@ -27,8 +60,144 @@ def group_amounts(iterator: Iterator[T], n: int) -> Iterator[Iterator[T]]:
     if n < 2:
         raise ValueError("n must be >= 2")
 
-    while (i := next(iterator, None)) is not None:
-        yield chain([i], islice(iterator, n - 1))
+    return map(iter, batched(iterator, n))
+
+
+def batched(iterable: Iterable[T], n: int) -> Iterator[tuple[T, ...]]:
+    """Generate tuples of n items, the last of which may be shorter.
+
+    Args
+    ----
+        iterable (Iterable[T]): the items.
+        n (int): the size of each batch.
+
+    Raises
+    ------
+        ValueError: for n < 1.
+
+    Yields
+    ------
+        Iterator[tuple[T, ...]]: the batches.
+    """
+    if n < 1:
+        raise ValueError("n must be >= 1")
+
+    iterator = iter(iterable)
+    while batch := tuple(islice(iterator, n)):
+        yield batch
+
+
+def sliding_window(iterable: Iterable[T], n: int) -> Iterator[tuple[T, ...]]:
+    """Generate every run of n consecutive items, e.g. ABCD -> ABC, BCD for n = 3.
+
+    Args
+    ----
+        iterable (Iterable[T]): the items.
+        n (int): the size of each window.
+
+    Raises
+    ------
+        ValueError: for n < 1.
+
+    Yields
+    ------
+        Iterator[tuple[T, ...]]: the windows, none at all if there are fewer than n
+            items.
+    """
+    if n < 1:
+        raise ValueError("n must be >= 1")
+
+    iterator = iter(iterable)
+    window = deque(islice(iterator, n - 1), maxlen=n)
+    for item in iterator:
+        window.append(item)
+        yield tuple(window)
+
+
+class WindowAggregate(Protocol[T_contra, R_co]):
+    def add(self, item: T_contra) -> None:
+        """Add an item entering the window."""
+
+    def remove(self, item: T_contra) -> None:
+        """Remove an item leaving the window."""
+
+    @property
+    def value(self) -> R_co:
+        """The aggregate of the items currently in the window."""
+
+
+class RollingSum:
+    def __init__(self) -> None:
+        self._total = 0
+
+    def add(self, item: int) -> None:
+        self._total += item
+
+    def remove(self, item: int) -> None:
+        self._total -= item
+
+    @property
+    def value(self) -> int:
+        return self._total
+
+
+class DistinctCount(Generic[H]):
+    def __init__(self) -> None:
+        self._counts: dict[H, int] = {}
+
+    def add(self, item: H) -> None:
+        self._counts[item] = self._counts.get(item, 0) + 1
+
+    def remove(self, item: H) -> None:
+        if (count := self._counts[item]) == 1:
+            del self._counts[item]
+        else:
+            self._counts[item] = count - 1
+
+    @property
+    def value(self) -> int:
+        return len(self._counts)
+
+
+def rolling(
+    iterable: Iterable[T], n: int, aggregate: WindowAggregate[T, R_co]
+) -> Iterator[R_co]:
+    """Aggregate every window of n consecutive items, like `sliding_window`.
+
+    Rather than building each window, the aggregate is updated as each item enters
+    the window and again as it leaves, so each step costs the same whatever n is.
+
+    Args
+    ----
+        iterable (Iterable[T]): the items.
+        n (int): the size of each window.
+        aggregate (WindowAggregate[T, R_co]): the aggregate, such as a `RollingSum`
+            or `DistinctCount`, which should start empty.
+
+    Raises
+    ------
+        ValueError: for n < 1.
+
+    Yields
+    ------
+        Iterator[R_co]: the aggregate's value for each window.
+    """
+    if n < 1:
+        raise ValueError("n must be >= 1")
+
+    iterator = iter(iterable)
+    window = deque(islice(iterator, n), maxlen=n)
+    if len(window) < n:
+        return
+
+    consume(map(aggregate.add, window))
+    yield aggregate.value
+
+    for item in iterator:
+        aggregate.remove(window[0])
+        window.append(item)
+        aggregate.add(item)
+        yield aggregate.value
 
 
 def map_to_dict(d: dict[S, T], iterator: Iterator[S]) -> Iterator[T]:
@@ -66,19 +235,92 @@ def consume(iterator: Iterator[T], n: int | None = None) -> None:
         next(islice(iterator, n, n), None)
 
 
-def iter_len(iterator: Iterator[T]) -> tuple[Iterator[T], int]:
-    """Calculate the length of an iterator.
+class SizedIterator(Iterator[T]):
+    def __init__(self, iterable: Iterable[T], length: int) -> None:
+        """Create an iterator that knows how many items it has left.
+
+        Args
+        ----
+            iterable (Iterable[T]): the items.
+            length (int): how many items there are.
+        """
+        self._iterator = iter(iterable)
+        self._remaining = length
+
+    @classmethod
+    def of(cls: type["SizedIterator[T]"], items: Collection[T]) -> "SizedIterator[T]":
+        """Iterate over a collection, such as a list or range, keeping its length."""
+        return cls(items, len(items))
+
+    @classmethod
+    def of_slice(
+        cls: type["SizedIterator[T]"],
+        items: Sequence[T],
+        start: int | None,
+        stop: int | None,
+        step: int | None = None,
+    ) -> "SizedIterator[T]":
+        """Iterate over a slice of a sequence without copying it."""
+        indices = range(len(items))[start:stop:step]
+        return cls(map(items.__getitem__, indices), len(indices))
+
+    def __next__(self) -> T:
+        item = next(self._iterator)
+        self._remaining -= 1
+        return item
+
+    def __len__(self) -> int:
+        return self._remaining
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(remaining={self._remaining})"
+
+
+class CountingIterator(Iterator[T]):
+    def __init__(self, iterable: Iterable[T]) -> None:
+        """Count the items pulled through an iterator, without keeping any of them.
+
+        Args
+        ----
+            iterable (Iterable[T]): the items.
+        """
+        self._iterator = iter(iterable)
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """The number of items pulled so far, which is the length once exhausted."""
+        return self._count
+
+    def __next__(self) -> T:
+        item = next(self._iterator)
+        self._count += 1
+        return item
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(count={self._count})"
+
+
+def iter_len(iterable: Iterable[T]) -> tuple[Iterator[T], int]:
+    """Calculate the length of an iterable, keeping hold of its items.
+
+    Sized iterables, such as lists, ranges and `SizedIterator`s, are measured without
+    being read. Anything else has to be read into memory, so where the length is only
+    needed afterwards, pull the items through a `CountingIterator` instead.
 
     Args
     ----
-        iterator (Iterator[T]): the iterator to calculate length for.
+        iterable (Iterable[T]): the iterable to calculate length for.
 
     Returns
     -------
-        tuple[Iterator[T], int]: the original iterator and its length.
+        tuple[Iterator[T], int]: an iterator over the same items, and their number.
     """
-    returned_iterator, length_iterator = tee(iterator)
-    return (returned_iterator, sum(1 for _ in length_iterator))
+    if isinstance(iterable, Sized):
+        return (iter(iterable), len(iterable))
+
+    items = list(iterable)
+    return (iter(items), len(items))
 
 
 def call_method(method: Callable[..., T]) -> Callable[[S], T]:
@@ -145,3 +387,213 @@ def transpose(iterator: Iterator[Iterable[T]]) -> Iterator[Iterable[T]]:
         Iterator[Iterator[T]]: the transposed iterator.
     """
     return zip(*iterator)
+
+
+def pmap(
+    fn: Callable[[S], T],
+    iterable: Iterable[S],
+    executor: Executor | None = None,
+    chunk_size: int = 1024,
+    ordered: bool = True,
+    max_pending: int = 16,
+) -> Iterator[T]:
+    """Map a function over an iterable in parallel, a chunk of items at a time.
+
+    The function and each chunk are sent to the executor together, so for a process
+    pool they must be picklable, and a function carrying a lot of state is better
+    off with large chunks.
+
+    Args
+    ----
+        fn (Callable[[S], T]): the function to map.
+        iterable (Iterable[S]): the items to map it over.
+        executor (Executor | None, optional): the pool to map in. Defaults to None,
+            to map in this thread like `map`.
+        chunk_size (int, optional): the number of items sent to the pool at a time.
+            Defaults to 1024.
+        ordered (bool, optional): whether results come in the order of their items,
+            rather than as soon as their chunk is done, such as for a reduction that
+            doesn't care about order. Defaults to True.
+        max_pending (int, optional): the most chunks in the pool at once, so that long
+            iterables aren't read ahead of the results. Defaults to 16.
+
+    Raises
+    ------
+        ValueError: for chunk_size < 1 or max_pending < 1.
+
+    Yields
+    ------
+        Iterator[T]: the results.
+    """
+    return _pmap(map, fn, iterable, executor, chunk_size, ordered, max_pending)
+
+
+def pstarmap(
+    fn: Callable[..., T],
+    iterable: Iterable[Iterable[Any]],
+    executor: Executor | None = None,
+    chunk_size: int = 1024,
+    ordered: bool = True,
+    max_pending: int = 16,
+) -> Iterator[T]:
+    """Map a function over an iterable of argument tuples in parallel, like `pmap`.
+
+    Args
+    ----
+        fn (Callable[..., T]): the function to map.
+        iterable (Iterable[Iterable[Any]]): the arguments for each call.
+        executor (Executor | None, optional): the pool to map in. Defaults to None,
+            to map in this thread like `starmap`.
+        chunk_size (int, optional): the number of calls sent to the pool at a time.
+            Defaults to 1024.
+        ordered (bool, optional): whether results come in the order of their
+            arguments. Defaults to True.
+        max_pending (int, optional): the most chunks in the pool at once. Defaults
+            to 16.
+
+    Raises
+    ------
+        ValueError: for chunk_size < 1 or max_pending < 1.
+
+    Yields
+    ------
+        Iterator[T]: the results.
+    """
+    return _pmap(starmap, fn, iterable, executor, chunk_size, ordered, max_pending)
+
+
+def _pmap(
+    map_fn: Callable[[Callable[..., T], Iterable[Any]], Iterator[T]],
+    fn: Callable[..., T],
+    iterable: Iterable[Any],
+    executor: Executor | None,
+    chunk_size: int,
+    ordered: bool,
+    max_pending: int,
+) -> Iterator[T]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if max_pending < 1:
+        raise ValueError("max_pending must be >= 1")
+
+    if executor is None:
+        return map_fn(fn, iterable)
+
+    futures = (
+        executor.submit(_map_chunk, map_fn, fn, chunk)
+        for chunk in batched(iterable, chunk_size)
+    )
+    collect = _collect_in_order if ordered else _collect_as_completed
+    return collect(futures, max_pending)
+
+
+def _map_chunk(
+    map_fn: Callable[[Callable[..., T], Iterable[Any]], Iterator[T]],
+    fn: Callable[..., T],
+    chunk: tuple[Any, ...],
+) -> list[T]:
+    return list(map_fn(fn, chunk))
+
+
+def _collect_in_order(
+    futures: Iterator[Future[list[T]]], max_pending: int
+) -> Iterator[T]:
+    pending = deque(islice(futures, max_pending))
+    try:
+        while pending:
+            results = pending.popleft().result()
+            # Keep the pool busy whilst these results are used
+            pending.extend(islice(futures, 1))
+            yield from results
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _collect_as_completed(
+    futures: Iterator[Future[list[T]]], max_pending: int
+) -> Iterator[T]:
+    pending = set(islice(futures, max_pending))
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending.update(islice(futures, len(done)))
+            for future in done:
+                yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def instrument(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """Record how many items a pipeline stage yields, and how long pulling them takes.
+
+    Pulling an item includes running every lazy stage before it, so a stage's time
+    includes the time of the stages feeding it. Stages sharing a name are added up.
+
+    Args
+    ----
+        name (str): the stage's name in the report, e.g. "day_04.ranges".
+        iterable (Iterable[T]): the stage.
+
+    Returns
+    -------
+        Iterable[T]: the stage, which is returned untouched unless instrumentation
+            is enabled.
+    """
+    if _stages is None:
+        return iterable
+    if name not in _stages:
+        _stages[name] = StageStats()
+    return _instrumented(_stages[name], iter(iterable))
+
+
+@contextmanager
+def instrumentation() -> Iterator[dict[str, StageStats]]:
+    """Enable `instrument` for pipelines built in the enclosed code.
+
+    Yields
+    ------
+        Iterator[dict[str, StageStats]]: the stats of each stage, by name, which fill
+            in as the pipelines are consumed.
+    """
+    global _stages
+
+    previous, _stages = _stages, {}
+    try:
+        yield _stages
+    finally:
+        _stages = previous
+
+
+def format_stage_report(stages: dict[str, StageStats]) -> str:
+    """Format stage stats as a table, one stage per line.
+
+    Args
+    ----
+        stages (dict[str, StageStats]): the stats of each stage, by name.
+
+    Returns
+    -------
+        str: the report.
+    """
+    width = max(map(len, stages), default=0)
+    return "\n".join(
+        f"{name:<{width}} {stats.items:>10} items {stats.seconds:>10.6f}s "
+        f"{stats.items_per_second:>14,.0f} items/s"
+        for name, stats in stages.items()
+    )
+
+
+def _instrumented(stats: StageStats, iterator: Iterator[T]) -> Iterator[T]:
+    clock = time.perf_counter
+    while True:
+        start = clock()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            stats.seconds += clock() - start
+            return
+        stats.seconds += clock() - start
+        stats.items += 1
+        yield item
@@ -1,14 +1,46 @@
-import importlib
+import asyncio
+import json
+import os
 import shutil
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, closing
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from string import Template
-from typing import Any
+from types import ModuleType
+from typing import Any, Callable, Iterable, Sequence
 
-from aoc_2022 import iterutils, utils
+from aoc_2022 import (
+    answers,
+    batch,
+    bench,
+    budgets,
+    client,
+    input_store,
+    parse_cache,
+    pipeline,
+    profiling,
+    server,
+    utils,
+)
+from aoc_2022.iterutils import consume
 
 ROOT_DIR = Path(__file__).parent
 TEST_DIR = ROOT_DIR.parent.parent.joinpath("tests")
+OUTPUT_FORMATS = ("text", "json", "ndjson")
+
+
+@dataclass(frozen=True)
+class Solved:
+    puzzle_id: int
+    answers: tuple[Any, Any]
+    # Only filled in when measuring, and never for cached answers
+    measurements: list[profiling.Measurement] = field(default_factory=list)
+
+
+SolvedFuture = Future[Solved | None] | asyncio.Future[Solved | None]
 
 
 def make_parser() -> ArgumentParser:
@@ -27,6 +59,200 @@ def make_parser() -> ArgumentParser:
     run_parser.add_argument(
         "day", nargs="?", default=None, type=int, help="the day to run"
     )
+    run_parser.add_argument(
+        "-j",
+        "--jobs",
+        default=os.cpu_count(),
+        type=int,
+        help="the number of worker processes to use when running all days",
+    )
+    run_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile each part with cProfile, dumping pstats files",
+    )
+    run_parser.add_argument(
+        "--trace-alloc",
+        action="store_true",
+        help="trace each part's allocations, dumping the top allocation sites",
+    )
+    run_parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="print the items, time and throughput of each instrumented pipeline "
+        "stage after each part",
+    )
+    run_parser.add_argument(
+        "--split-parts",
+        action="store_true",
+        help="solve each day's two parts concurrently in separate worker processes",
+    )
+    run_parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="ignore cached answers and solve afresh",
+    )
+    run_parser.add_argument(
+        "--cache-parsed",
+        action="store_true",
+        help="keep each day's parsed input in a binary cache, for the days that can",
+    )
+    run_parser.add_argument(
+        "--input-id",
+        default=None,
+        help="run on this input from the input store, instead of the downloaded input",
+    )
+    run_parser.add_argument(
+        "--inputs",
+        dest="inputs_dir",
+        default=None,
+        type=Path,
+        help="solve every input_XX* file in this directory, printing results as "
+        "NDJSON, with no caching, profiling or tracing",
+    )
+    run_parser.add_argument(
+        "--format",
+        dest="output_format",
+        default="text",
+        choices=OUTPUT_FORMATS,
+        help="print answers for people to read, or the answer, time taken and peak "
+        "memory of each part as JSON, or as NDJSON with one part per line",
+    )
+    run_parser.add_argument(
+        "--budgets",
+        default=None,
+        type=Path,
+        help="a TOML file of time and memory budgets for each day, which runs each "
+        "day in a supervised subprocess",
+    )
+    run_parser.add_argument(
+        "--time-limit",
+        default=None,
+        type=float,
+        help="the time budget in seconds for days without their own",
+    )
+    run_parser.add_argument(
+        "--memory-limit",
+        default=None,
+        type=int,
+        help="the memory budget in MiB for days without their own, which applies to "
+        "each of a day's processes, e.g. each part with --split-parts",
+    )
+
+    bench_parser = action_parsers.add_parser(
+        "bench",
+        description="Benchmark AoC solutions",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    bench_parser.add_argument(
+        "day", nargs="?", default=None, type=int, help="the day to benchmark"
+    )
+    bench_parser.add_argument(
+        "--repeat", default=10, type=int, help="the number of timed runs per part"
+    )
+    bench_parser.add_argument(
+        "--warmup", default=1, type=int, help="the number of untimed runs per part"
+    )
+    bench_parser.add_argument(
+        "--output",
+        default=bench.OUTPUT_FILE,
+        type=Path,
+        help="the NDJSON file each run's results are appended to",
+    )
+    bench_parser.add_argument(
+        "--scale",
+        nargs="+",
+        default=None,
+        type=float,
+        help="run on generated input of these sizes instead of the cached input, "
+        "relative to a typical puzzle input",
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        default=bench.BASELINE_FILE,
+        type=Path,
+        help="the JSON file baseline results are saved to and checked against",
+    )
+    baseline_group = bench_parser.add_mutually_exclusive_group()
+    baseline_group.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="save the results as the new baseline",
+    )
+    baseline_group.add_argument(
+        "--check-baseline",
+        action="store_true",
+        help="exit with an error if any part is slower than its baseline",
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        default=0.15,
+        type=float,
+        help="the largest slowdown allowed by --check-baseline, e.g. 0.15 for 15%%",
+    )
+
+    prefetch_parser = action_parsers.add_parser(
+        "prefetch",
+        description="Download AoC puzzle inputs that aren't cached yet",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    prefetch_parser.add_argument(
+        "first", nargs="?", default=1, type=int, help="the first day to download"
+    )
+    prefetch_parser.add_argument(
+        "last", nargs="?", default=25, type=int, help="the last day to download"
+    )
+    prefetch_parser.add_argument(
+        "--connections",
+        default=4,
+        type=int,
+        help="the number of connections to download over concurrently",
+    )
+    prefetch_parser.add_argument(
+        "--url",
+        default=utils.URL,
+        help="the input URL, with {} in place of the day",
+    )
+
+    store_parser = action_parsers.add_parser(
+        "store",
+        description="Manage the compressed store of extra AoC puzzle inputs",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    store_action_parsers = store_parser.add_subparsers(
+        dest="store_action", required=True, help="the store action to take"
+    )
+    store_add_parser = store_action_parsers.add_parser(
+        "add",
+        description="Compress an input file into the store",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    store_add_parser.add_argument("day", type=int, help="the day the input is for")
+    store_add_parser.add_argument("file", type=Path, help="the input file to add")
+    store_add_parser.add_argument(
+        "--id",
+        dest="input_id",
+        default="default",
+        help="the name to store the input under, e.g. an account or a stress test",
+    )
+    store_action_parsers.add_parser("list", description="List the stored inputs")
+    store_action_parsers.add_parser(
+        "verify", description="Check every stored input against its checksum"
+    )
+
+    serve_parser = action_parsers.add_parser(
+        "serve",
+        description="Keep AoC solutions imported, running commands forwarded by "
+        "python -m aoc_2022.client",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    serve_parser.add_argument(
+        "--socket",
+        default=client.SOCKET_PATH,
+        type=Path,
+        help="the Unix socket to listen on",
+    )
 
     generate_parser = action_parsers.add_parser(
         "generate",
@@ -51,31 +277,406 @@ def get_display(result: Any) -> str:
         return str(result)
 
 
-def run_one(puzzle_id: int) -> None:
-    module_name = f"aoc_2022.day_{puzzle_id:02}"
+def get_parser(cache_parsed: bool) -> Callable[[ModuleType, utils.PuzzleInput], Any]:
+    return parse_cache.parse_cached if cache_parsed else utils.parse_input
+
+
+def run_step(
+    hooks: Sequence[profiling.PartHook],
+    measurements: list[profiling.Measurement] | None,
+    label: str,
+    fn: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    if measurements is None:
+        return profiling.run_hooked(hooks, label, fn, *args)
+
+    result, measurement = profiling.measure(
+        label, profiling.run_hooked, hooks, label, fn, *args
+    )
+    measurements.append(measurement)
+    return result
+
+
+def solve_hooked(
+    module: ModuleType,
+    data: utils.PuzzleInput,
+    hooks: Sequence[profiling.PartHook],
+    cache_parsed: bool = False,
+    measurements: list[profiling.Measurement] | None = None,
+) -> tuple[Any, Any]:
+    label = module.__name__.rpartition(".")[2]
+    parse = get_parser(cache_parsed)
+    run = partial(run_step, hooks, measurements)
+
+    parsed = (
+        run(f"{label}.parse", parse, module, data) if hasattr(module, "parse") else data
+    )
+
+    return (
+        run(f"{label}.part_1", utils.solve_part, module, 1, parsed),
+        run(f"{label}.part_2", utils.solve_part, module, 2, parsed),
+    )
+
+
+def solve_part_alone(
+    puzzle_id: int,
+    part_number: int,
+    data: utils.PuzzleInput,
+    hooks: Sequence[profiling.PartHook],
+    cache_parsed: bool = False,
+    measure: bool = False,
+) -> tuple[Any, list[profiling.Measurement]]:
+    module = utils.import_solution(puzzle_id)
+    if module is None:
+        raise ModuleNotFoundError(f"no solution for day {puzzle_id}")
+
+    parse = get_parser(cache_parsed)
+
+    def parse_and_solve(module: ModuleType) -> Any:
+        return utils.solve_part(module, part_number, parse(module, data))
+
+    # Each process parses for itself, so any parsing is profiled as part of the part
+    label = f"day_{puzzle_id:02}.part_{part_number}"
+    measurements: list[profiling.Measurement] | None = [] if measure else None
+    answer = run_step(hooks, measurements, label, parse_and_solve, module)
+    return (answer, measurements or [])
+
+
+def solve_split(
+    puzzle_id: int,
+    data: utils.PuzzleInput,
+    hooks: Sequence[profiling.PartHook],
+    cache_parsed: bool = False,
+    measurements: list[profiling.Measurement] | None = None,
+) -> tuple[Any, Any]:
+    solve_part = partial(
+        solve_part_alone,
+        puzzle_id,
+        data=data,
+        hooks=hooks,
+        cache_parsed=cache_parsed,
+        measure=measurements is not None,
+    )
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        (a, a_measurements), (b, b_measurements) = executor.map(solve_part, (1, 2))
+
+    if measurements is not None:
+        measurements.extend(a_measurements + b_measurements)
+
+    return (a, b)
+
+
+def solve_one(
+    puzzle_id: int,
+    hooks: Sequence[profiling.PartHook] = tuple(),
+    use_cache: bool = True,
+    split_parts: bool = False,
+    cache_parsed: bool = False,
+    input_id: str | None = None,
+    measure: bool = False,
+) -> Solved | None:
+    module = utils.import_solution(puzzle_id)
+    if module is None:
+        return None
+
+    if "main" not in dir(module):
+        raise AttributeError(f"{module.__name__} must have a main method")
+
+    # Profiling and measuring need the solution to actually run, so skip the cache
+    use_cache = use_cache and not hooks and not measure
+
+    key = answers.make_key(puzzle_id, module, input_id) if use_cache else None
+    if key is not None and (cached := answers.load_answers(puzzle_id, key)):
+        return Solved(puzzle_id, cached)
+
+    data = utils.fetch_input(puzzle_id, input_id)
+    measurements: list[profiling.Measurement] | None = [] if measure else None
+
+    if split_parts:
+        a, b = solve_split(puzzle_id, data, hooks, cache_parsed, measurements)
+    elif hooks or cache_parsed or measure:
+        a, b = solve_hooked(module, data, hooks, cache_parsed, measurements)
+    else:
+        a, b = module.main(data)
+
+    # The input may have only just been downloaded, so the key can be made now
+    if use_cache and (key := key or answers.make_key(puzzle_id, module, input_id)):
+        answers.save_answers(puzzle_id, key, (a, b))
+
+    return Solved(puzzle_id, (a, b), measurements or [])
+
+
+def get_solved_display(solved: Solved) -> str:
+    a, b = solved.answers
+    return f"{solved.puzzle_id:02} -> {get_display(a)}, {get_display(b)}"
+
+
+def get_records(solved: Solved) -> list[dict[str, Any]]:
+    def to_record(measurement: profiling.Measurement) -> dict[str, Any]:
+        stage = measurement.label.rpartition(".")[2]
+        _, _, part_number = stage.partition("_")
+        return {
+            "day": solved.puzzle_id,
+            "stage": stage,
+            "answer": solved.answers[int(part_number) - 1] if part_number else None,
+            "wall_seconds": measurement.wall_seconds,
+            "cpu_seconds": measurement.cpu_seconds,
+            "peak_rss_kib": measurement.peak_rss_kib,
+        }
+
+    return list(map(to_record, solved.measurements))
+
+
+def print_failure(puzzle_id: int, e: Exception, output_format: str) -> None:
+    failure = {"day": puzzle_id, "error": repr(e)}
+    if output_format == "text":
+        print(f"{puzzle_id:02} -> failed with {e!r}")
+    elif output_format == "ndjson":
+        print(json.dumps(failure), flush=True)
+    else:
+        print(json.dumps([failure], indent=2))
+
+
+def solve_within_budget(
+    day_budgets: budgets.Budgets, solve: Callable[[int], Solved | None], puzzle_id: int
+) -> Solved | None:
+    return budgets.run_within(day_budgets.for_day(puzzle_id), solve, puzzle_id)
+
+
+def print_solved(solved: Solved, output_format: str) -> None:
+    if output_format == "text":
+        print(get_solved_display(solved))
+    elif output_format == "ndjson":
+        print("\n".join(map(json.dumps, get_records(solved))), flush=True)
+    else:
+        print(json.dumps(get_records(solved), indent=2))
+
+
+def run_one(
+    puzzle_id: int,
+    hooks: Sequence[profiling.PartHook] = tuple(),
+    use_cache: bool = True,
+    split_parts: bool = False,
+    cache_parsed: bool = False,
+    input_id: str | None = None,
+    output_format: str = "text",
+    day_budgets: budgets.Budgets | None = None,
+) -> None:
+    measure = output_format != "text"
+    args = (puzzle_id, hooks, use_cache, split_parts, cache_parsed, input_id, measure)
+
     try:
-        module = importlib.import_module(module_name)
-    except ModuleNotFoundError:
+        if day_budgets is None:
+            solved = solve_one(*args)
+        else:
+            budget = day_budgets.for_day(puzzle_id)
+            solved = budgets.run_within(budget, solve_one, *args)
+    except input_store.MissingInputError as e:
+        print_failure(puzzle_id, e, output_format)
+        return
+    except (TimeoutError, MemoryError, RuntimeError) as e:
+        if day_budgets is None:
+            raise
+        # Report going over budget, or the subprocess dying, like any failure
+        print_failure(puzzle_id, e, output_format)
         return
 
-    if "main" not in dir(module):
-        raise AttributeError(f"{module_name} must have a main method")
+    if solved is not None:
+        print_solved(solved, output_format)
+
+
+def run_all(
+    jobs: int,
+    hooks: Sequence[profiling.PartHook] = tuple(),
+    use_cache: bool = True,
+    split_parts: bool = False,
+    cache_parsed: bool = False,
+    input_id: str | None = None,
+    output_format: str = "text",
+    day_budgets: budgets.Budgets | None = None,
+) -> None:
+    # Only days with a solution, so that no input is downloaded for nothing
+    puzzle_ids = [p for p in range(1, 26) if utils.import_solution(p) is not None]
+    solve_day = partial(
+        solve_one,
+        hooks=hooks,
+        use_cache=use_cache,
+        split_parts=split_parts,
+        cache_parsed=cache_parsed,
+        input_id=input_id,
+        measure=output_format != "text",
+    )
+    # Each day runs in a supervised process of its own, so one that dies, e.g. when
+    # killed for running out of memory, can't take any other day down with it, as
+    # it would a shared pool. Threads just wait on them
+    solve: Callable[[int], Solved | None] = partial(
+        solve_within_budget, day_budgets or budgets.Budgets(), solve_day
+    )
+    # A JSON document can only be printed once every day is in
+    records: list[dict[str, Any]] = []
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor, ExitStack() as stack:
+        solutions: Iterable[tuple[int, SolvedFuture]]
+        if input_id is None:
+            # Download the inputs that aren't cached yet whilst solving the others,
+            # closing the pipeline even if printing fails part way through
+            solutions = stack.enter_context(
+                closing(pipeline.solve_pipelined(solve, puzzle_ids, executor))
+            )
+        else:
+            futures = [executor.submit(solve, p) for p in puzzle_ids]
+            solutions = zip(puzzle_ids, futures)
+
+        # Collect in submission order so output stays in day order, whilst a
+        # failing day is reported without taking the remaining days down with it
+        for puzzle_id, future in solutions:
+            try:
+                solved = future.result()
+            except Exception as e:
+                if output_format == "json":
+                    records.append({"day": puzzle_id, "error": repr(e)})
+                else:
+                    print_failure(puzzle_id, e, output_format)
+                continue
 
-    data = utils.fetch_input(puzzle_id)
+            if solved is None:
+                continue
 
-    a, b = module.main(data)
-    print(f"{puzzle_id:02} -> {get_display(a)}, {get_display(b)}")
+            if output_format == "json":
+                records.extend(get_records(solved))
+            else:
+                print_solved(solved, output_format)
 
+    if output_format == "json":
+        print(json.dumps(records, indent=2))
 
-def run_all() -> None:
-    iterutils.consume(map(run_one, range(1, 26)))
 
+def get_hooks(
+    profile: bool, trace_alloc: bool, instrument: bool = False
+) -> list[profiling.PartHook]:
+    hooks: list[profiling.PartHook] = []
+    if profile:
+        hooks.append(profiling.profile)
+    if trace_alloc:
+        hooks.append(profiling.trace_alloc)
+    if instrument:
+        hooks.append(profiling.instrument_stages)
+    return hooks
 
-def run(puzzle_id: int | None) -> None:
+
+def run(
+    puzzle_id: int | None,
+    jobs: int,
+    profile: bool,
+    trace_alloc: bool,
+    instrument: bool,
+    use_cache: bool,
+    split_parts: bool,
+    cache_parsed: bool,
+    input_id: str | None,
+    inputs_dir: Path | None,
+    output_format: str,
+    budgets_file: Path | None,
+    time_limit: float | None,
+    memory_limit: int | None,
+) -> int | None:
+    if inputs_dir is not None:
+        return run_batch(inputs_dir, puzzle_id, jobs)
+
+    hooks = get_hooks(profile, trace_alloc, instrument)
+    day_budgets = (
+        budgets.read_budgets(budgets_file, time_limit, memory_limit)
+        if budgets_file or time_limit or memory_limit
+        else None
+    )
+
+    options = (
+        hooks,
+        use_cache,
+        split_parts,
+        cache_parsed,
+        input_id,
+        output_format,
+        day_budgets,
+    )
     if puzzle_id is None:
-        run_all()
+        run_all(jobs, *options)
     else:
-        run_one(puzzle_id)
+        run_one(puzzle_id, *options)
+
+    return None
+
+
+def run_batch(inputs_dir: Path, puzzle_id: int | None, jobs: int) -> int:
+    failures = 0
+    for result in batch.run_batch(batch.find_inputs(inputs_dir, puzzle_id), jobs):
+        failures += result.error is not None
+        print(batch.to_json(result), flush=True)
+
+    return 1 if failures else 0
+
+
+def run_bench(
+    puzzle_id: int | None,
+    repeats: int,
+    warmup: int,
+    output: Path,
+    scales: list[float] | None,
+    baseline: Path,
+    save_baseline: bool,
+    check_baseline: bool,
+    threshold: float,
+) -> int:
+    # Check before benchmarking, rather than after a long run that can't be compared
+    if check_baseline and not baseline.exists():
+        print(f"No baseline at {baseline}; run with --save-baseline first")
+        return 1
+
+    results = bench.bench(puzzle_id, repeats, warmup, output, scales)
+
+    if save_baseline:
+        bench.save_baseline(results, baseline)
+    elif check_baseline and not bench.check_baseline(results, threshold, baseline):
+        return 1
+
+    return 0
+
+
+def prefetch(first: int, last: int, connections: int, url: str) -> None:
+    downloaded = utils.prefetch_inputs(range(first, last + 1), url, connections)
+    print(f"Downloaded {len(downloaded)} input(s): {', '.join(map(str, downloaded))}")
+
+
+def store_add(puzzle_id: int, input_file: Path, input_id: str) -> None:
+    with input_file.open(mode="rb") as f:
+        chunks = iter(partial(f.read, utils.CHUNK_SIZE), b"")
+        entry = input_store.add_input(puzzle_id, input_id, chunks)
+
+    print(
+        f"Stored {input_store.get_key(puzzle_id, input_id)}: {entry.size} bytes, "
+        f"compressed to {entry.length}"
+    )
+
+
+def store_list() -> None:
+    for key, entry in input_store.read_index().items():
+        print(f"{key}: {entry.size} bytes, compressed to {entry.length}")
+
+
+def store_verify() -> int:
+    corrupt = 0
+    for key in input_store.read_index():
+        day, _, input_id = key.partition("/")
+        try:
+            consume(input_store.iter_input(int(day), input_id))
+        except ValueError as e:
+            corrupt += 1
+            print(e)
+
+    print(f"{corrupt} corrupt input(s)")
+    return 1 if corrupt else 0
 
 
 def generate(puzzle_id: int) -> None:
@@ -101,16 +702,50 @@ def generate(puzzle_id: int) -> None:
             f.write(content)
 
 
-def main() -> int:
-    args = make_parser().parse_args()
+def main(argv: Sequence[str] | None = None) -> int:
+    args = make_parser().parse_args(argv)
 
-    action, action_args = {
-        "run": (run, (args.day,)),
-        "generate": (generate, (args.day,)),
-    }.get(args.action, (lambda: None, tuple()))
+    # Each subcommand has its own arguments, so only read them once it's chosen
+    actions: dict[str, Callable[[], int | None]] = {
+        "run": lambda: run(
+            args.day,
+            args.jobs,
+            args.profile,
+            args.trace_alloc,
+            args.instrument,
+            args.use_cache,
+            args.split_parts,
+            args.cache_parsed,
+            args.input_id,
+            args.inputs_dir,
+            args.output_format,
+            args.budgets,
+            args.time_limit,
+            args.memory_limit,
+        ),
+        "bench": lambda: run_bench(
+            args.day,
+            args.repeat,
+            args.warmup,
+            args.output,
+            args.scale,
+            args.baseline,
+            args.save_baseline,
+            args.check_baseline,
+            args.threshold,
+        ),
+        "prefetch": lambda: prefetch(args.first, args.last, args.connections, args.url),
+        "store": lambda: {
+            "add": lambda: store_add(args.day, args.file, args.input_id),
+            "list": store_list,
+            "verify": store_verify,
+        }[args.store_action](),
+        "serve": lambda: server.serve(main, args.socket),
+        "generate": lambda: generate(args.day),
+    }
 
-    action(*action_args)
-    return 0
+    status = actions.get(args.action, lambda: None)()
+    return status or 0
 
 
 if __name__ == "__main__":
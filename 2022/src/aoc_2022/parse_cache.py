@@ -0,0 +1,73 @@
+import struct
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoc_2022.utils import CACHE_DIR, PuzzleInput, parse_input, write_atomically
+
+PARSE_CACHE_DIR = CACHE_DIR.parent.joinpath("parsed")
+# The SHA-256 digest of the input the entry was parsed from, then the parser version
+HEADER = struct.Struct("<32sI")
+
+__all__ = ["is_cacheable", "parse_cached"]
+
+
+def is_cacheable(module: ModuleType) -> bool:
+    """Check whether a solution can store its parsed input in the parse cache.
+
+    Solutions opt in by defining a `PARSER_VERSION` along with `pack(parsed)` and
+    `unpack(buffer)` hooks, which turn the result of their `parse` hook into bytes
+    and back again. The version must be bumped whenever the parser or the packed
+    format changes.
+
+    Args
+    ----
+        module (ModuleType): the solution module.
+
+    Returns
+    -------
+        bool: whether the solution supports the parse cache.
+    """
+    return all(
+        hasattr(module, name) for name in ("parse", "pack", "unpack", "PARSER_VERSION")
+    )
+
+
+def _parsed_file(module: ModuleType) -> Path:
+    return PARSE_CACHE_DIR.joinpath(f"{module.__name__.rpartition('.')[2]}.bin")
+
+
+def parse_cached(module: ModuleType, data: PuzzleInput) -> Any:
+    """Parse the puzzle input, loading a previously parsed copy if there is one.
+
+    Falls back on `utils.parse_input` for solutions that don't support the cache.
+
+    Args
+    ----
+        module (ModuleType): the solution module.
+        data (PuzzleInput): the puzzle input.
+
+    Returns
+    -------
+        Any: the parsed input, or the puzzle input itself if there is no parse hook.
+    """
+    if not is_cacheable(module):
+        return parse_input(module, data)
+
+    header = HEADER.pack(data.digest(), module.PARSER_VERSION)
+    parsed_file = _parsed_file(module)
+
+    try:
+        entry = parsed_file.read_bytes()
+    except IOError:
+        entry = b""
+
+    if entry[: HEADER.size] == header:
+        return module.unpack(memoryview(entry)[HEADER.size :])
+
+    parsed = module.parse(iter(data))
+
+    PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    write_atomically((header, module.pack(parsed)), parsed_file)
+
+    return parsed
@@ -0,0 +1,88 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, Generator, Sequence, TypeVar
+
+from aoc_2022 import utils
+
+T = TypeVar("T")
+
+__all__ = ["solve_pipelined"]
+
+
+def solve_pipelined(
+    solve: Callable[[int], T],
+    puzzle_ids: Sequence[int],
+    executor: Executor,
+    url: str = utils.URL,
+    max_connections: int = 4,
+) -> Generator[tuple[int, asyncio.Future[T]], None, None]:
+    """Solve each puzzle as soon as its input is fetched, whilst fetching the rest.
+
+    Downloading and solving overlap, so a run with nothing cached takes about as
+    long as the slower of the two, rather than both added together.
+
+    Args
+    ----
+        solve (Callable[[int], T]): solves a puzzle, given its ID, once its input is
+            cached.
+        puzzle_ids (Sequence[int]): the puzzle IDs (day numbers) to solve, which are
+            also downloaded in this order.
+        executor (Executor): where to solve the puzzles.
+        url (str, optional): the input URL, with a placeholder for the puzzle ID.
+            Defaults to utils.URL.
+        max_connections (int, optional): the number of connections to download
+            over concurrently. Defaults to 4.
+
+    Yields
+    ------
+        tuple[int, asyncio.Future[T]]: each puzzle ID in order, with its finished
+            solution, whose `result()` raises whatever solving it raised.
+    """
+    with asyncio.Runner() as runner:
+        prefetching, solving = runner.run(
+            _start(solve, puzzle_ids, executor, url, max_connections)
+        )
+
+        # The loop only runs whilst waiting, but downloads and solutions carry on in
+        # their own threads and processes in between
+        for puzzle_id, solution in zip(puzzle_ids, solving):
+            runner.run(asyncio.wait([solution]))
+            yield puzzle_id, solution
+
+        runner.run(asyncio.wait([prefetching]))
+
+
+async def _start(
+    solve: Callable[[int], T],
+    puzzle_ids: Sequence[int],
+    executor: Executor,
+    url: str,
+    max_connections: int,
+) -> tuple[asyncio.Task[list[int]], list[asyncio.Task[T]]]:
+    loop = asyncio.get_running_loop()
+    fetched = {puzzle_id: asyncio.Event() for puzzle_id in puzzle_ids}
+
+    def on_fetched(puzzle_id: int) -> None:
+        loop.call_soon_threadsafe(fetched[puzzle_id].set)
+
+    def on_prefetched(task: asyncio.Task[list[int]]) -> None:
+        # Solving fetches any input still missing itself, so a failed download is
+        # reported for each day it affects
+        if not task.cancelled():
+            task.exception()
+        for event in fetched.values():
+            event.set()
+
+    async def solve_when_fetched(puzzle_id: int) -> T:
+        await fetched[puzzle_id].wait()
+        return await loop.run_in_executor(executor, solve, puzzle_id)
+
+    prefetching = asyncio.create_task(
+        asyncio.to_thread(
+            utils.prefetch_inputs, puzzle_ids, url, max_connections, on_fetched
+        )
+    )
+    prefetching.add_done_callback(on_prefetched)
+
+    solving = [asyncio.create_task(solve_when_fetched(p)) for p in puzzle_ids]
+    return prefetching, solving
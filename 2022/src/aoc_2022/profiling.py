@@ -0,0 +1,183 @@
+import cProfile
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator, Sequence, TypeVar
+
+from aoc_2022 import iterutils
+from aoc_2022.utils import UTF8
+
+PROFILE_DIR = Path("./profile/")
+TOP_ALLOCATION_SITES = 20
+# Writing 5 here resets the process's peak RSS, on Linux
+CLEAR_REFS_FILE = Path("/proc/self/clear_refs")
+STATUS_FILE = Path("/proc/self/status")
+
+T = TypeVar("T")
+PartHook = Callable[[str], ContextManager[None]]
+
+__all__ = [
+    "Measurement",
+    "PartHook",
+    "instrument_stages",
+    "measure",
+    "profile",
+    "run_hooked",
+    "trace_alloc",
+]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    label: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_kib: int
+
+
+@contextmanager
+def profile(label: str) -> Iterator[None]:
+    """Profile the enclosed code with cProfile, dumping a pstats file.
+
+    Args
+    ----
+        label (str): the name of the dumped file, e.g. "day_07.part_1".
+
+    Yields
+    ------
+        Iterator[None]: control whilst profiling is active.
+    """
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(PROFILE_DIR / f"{label}.pstats")
+
+
+@contextmanager
+def trace_alloc(label: str) -> Iterator[None]:
+    """Trace the allocations of the enclosed code, dumping the top allocation sites.
+
+    Args
+    ----
+        label (str): the name of the dumped file, e.g. "day_07.part_1".
+
+    Yields
+    ------
+        Iterator[None]: control whilst allocations are being traced.
+    """
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+    tracemalloc.start()
+    try:
+        yield
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    top_stats = snapshot.statistics("lineno")[:TOP_ALLOCATION_SITES]
+    with PROFILE_DIR.joinpath(f"{label}.alloc.txt").open(mode="w", encoding=UTF8) as f:
+        f.write(f"peak traced memory: {peak} B\n")
+        f.writelines(f"{stat}\n" for stat in top_stats)
+
+
+@contextmanager
+def instrument_stages(label: str) -> Iterator[None]:
+    """Instrument the pipeline stages built in the enclosed code, printing a report.
+
+    Only stages wrapped in `iterutils.instrument` are reported.
+
+    Args
+    ----
+        label (str): the heading of the report, e.g. "day_07.part_1".
+
+    Yields
+    ------
+        Iterator[None]: control whilst stages are being instrumented.
+    """
+    with iterutils.instrumentation() as stages:
+        yield
+
+    if stages:
+        report = iterutils.format_stage_report(stages)
+        print(f"{label} stages:\n{report}", file=sys.stderr, flush=True)
+
+
+def run_hooked(
+    hooks: Sequence[PartHook], label: str, fn: Callable[..., T], *args: Any
+) -> T:
+    """Call a function with every hook active around it.
+
+    Args
+    ----
+        hooks (Sequence[PartHook]): the hooks to activate, outermost first.
+        label (str): the label passed to each hook.
+        fn (Callable[..., T]): the function to call.
+
+    Returns
+    -------
+        T: the function's result.
+    """
+    with ExitStack() as stack:
+        for hook in hooks:
+            stack.enter_context(hook(label))
+        result = fn(*args)
+
+    return result
+
+
+def _reset_peak_rss() -> None:
+    try:
+        CLEAR_REFS_FILE.write_text("5")
+    except OSError:
+        pass
+
+
+def _get_peak_rss_kib() -> int:
+    try:
+        with STATUS_FILE.open(mode="r", encoding=UTF8) as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    # Elsewhere, fall back on the peak over the whole life of the process
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(label: str, fn: Callable[..., T], *args: Any) -> tuple[T, Measurement]:
+    """Call a function, measuring its time and memory use.
+
+    Only timers and a couple of small reads and writes of /proc are involved, so the
+    function runs at full speed, unlike under the other hooks.
+
+    Args
+    ----
+        label (str): the label of the measurement, e.g. "day_07.part_1".
+        fn (Callable[..., T]): the function to call.
+
+    Returns
+    -------
+        tuple[T, Measurement]: the function's result, and its measurement. The peak
+            RSS is the peak whilst the function ran where the platform can reset it,
+            which Linux can, or otherwise the peak of the process so far.
+    """
+    _reset_peak_rss()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    result = fn(*args)
+
+    wall_seconds = time.perf_counter() - wall_start
+    cpu_seconds = time.process_time() - cpu_start
+    return result, Measurement(label, wall_seconds, cpu_seconds, _get_peak_rss_kib())
@@ -0,0 +1,166 @@
+import importlib
+import io
+import json
+import os
+import re
+import socketserver
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from aoc_2022 import utils
+from aoc_2022.client import FORWARDED_ACTIONS, UTF8
+
+PACKAGE_NAME = __name__.partition(".")[0]
+SOLUTION_MODULE_PATTERN = re.compile(rf"{PACKAGE_NAME}\.day_\d+$")
+
+MainFn = Callable[[Sequence[str]], int]
+
+__all__ = ["SolverServer", "handle_request", "serve"]
+
+
+def get_source_mtimes() -> dict[str, int]:
+    return {
+        name: os.stat(path).st_mtime_ns
+        for name, module in list(sys.modules.items())
+        if name.startswith(f"{PACKAGE_NAME}.")
+        and (path := getattr(module, "__file__", None)) is not None
+    }
+
+
+def reload_changed(mtimes: dict[str, int]) -> dict[str, int]:
+    """Reload any of the package's modules that have been edited since last checked.
+
+    Solutions import names from the modules they rely on, so every solution is
+    reloaded whenever anything changes, to pick up the new versions.
+
+    Other modules aren't reloaded unless they changed themselves, so any names they
+    imported with `from aoc_2022.x import y` still refer to the old versions, e.g.
+    editing `utils.UTF8` doesn't change `profiling.UTF8`. Restart the server after
+    editing anything that other support modules import from.
+
+    Args
+    ----
+        mtimes (dict[str, int]): the modification times from the last check.
+
+    Returns
+    -------
+        dict[str, int]: the current modification times.
+    """
+    current = get_source_mtimes()
+    # Modules imported since the last check are already up to date
+    changed = sorted(
+        name for name in current.keys() & mtimes.keys() if mtimes[name] != current[name]
+    )
+    if not changed:
+        return current
+
+    for name in changed:
+        if not SOLUTION_MODULE_PATTERN.match(name):
+            importlib.reload(sys.modules[name])
+
+    for name in sorted(filter(SOLUTION_MODULE_PATTERN.match, sys.modules)):
+        importlib.reload(sys.modules[name])
+
+    return get_source_mtimes()
+
+
+def handle_request(main: MainFn, request: dict[str, Any]) -> dict[str, Any]:
+    """Run a forwarded command, capturing its output.
+
+    Args
+    ----
+        main (MainFn): the command line entry point.
+        request (dict[str, Any]): the command line arguments and working directory
+            sent by the client.
+
+    Returns
+    -------
+        dict[str, Any]: the command's exit status and output.
+    """
+    argv = request["argv"]
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    if not argv or argv[0] not in FORWARDED_ACTIONS:
+        return {"status": 2, "stdout": "", "stderr": f"can't forward {argv!r}\n"}
+
+    # Paths such as the input cache are relative, so run from the client's directory
+    os.chdir(request["cwd"])
+
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            status = main(argv)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"failed with {e!r}", file=sys.stderr)
+            status = 1
+
+    return {"status": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: Path, main: MainFn) -> None:
+        """Create a server that runs forwarded commands through `main`.
+
+        Args
+        ----
+            socket_path (Path): the Unix socket to listen on.
+            main (MainFn): the command line entry point.
+        """
+        self.main = main
+        self.mtimes = get_source_mtimes()
+        super().__init__(str(socket_path), RequestHandler)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    server: SolverServer
+
+    def handle(self) -> None:
+        # Read the whole request before anything can fail, or the client may still be
+        # writing it when the connection closes, and never see the reply
+        line = self.rfile.readline()
+
+        # Always reply, even if an edited module doesn't import, so the client isn't
+        # left with nothing
+        try:
+            self.server.mtimes = reload_changed(self.server.mtimes)
+
+            request = json.loads(line)
+            response = handle_request(self.server.main, request)
+        except Exception:
+            response = {"status": 1, "stdout": "", "stderr": traceback.format_exc()}
+
+        self.wfile.write(json.dumps(response).encode(UTF8) + b"\n")
+
+
+def serve(main: MainFn, socket_path: Path) -> None:
+    """Keep every solution imported, solving requests forwarded by the client.
+
+    Requests are handled one at a time, since each takes over the process's working
+    directory and output.
+
+    Args
+    ----
+        main (MainFn): the command line entry point to run requests through.
+        socket_path (Path): the Unix socket to listen on.
+    """
+    # Requests change directory, so don't lose track of where the socket is
+    socket_path = socket_path.resolve()
+
+    for puzzle_id in range(1, 26):
+        utils.import_solution(puzzle_id)
+
+    # A socket left behind by a server that didn't shut down cleanly
+    socket_path.unlink(missing_ok=True)
+
+    with SolverServer(socket_path, main) as server:
+        print(f"Serving on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
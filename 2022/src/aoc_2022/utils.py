@@ -1,70 +1,521 @@
+import hashlib
+import http.client
 import http.cookiejar
+import importlib
 import json
+import mmap
+import multiprocessing
+import os
+import queue
+import tempfile
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing.context import ForkServerContext, SpawnContext
 from pathlib import Path
-from typing import Iterator, TextIO
+from types import ModuleType
+from typing import Any, AnyStr, Callable, Iterable, Iterator
+
+from aoc_2022 import input_store
 
 CACHE_DIR = Path("./input/")
 ENV_FILE = Path("./.env")
 URL = "https://adventofcode.com/2022/day/{}/input"
+USER_AGENT = "dev@wallparty.horse"
 UTF8 = "utf-8"
+# Inputs at least this large are memory mapped rather than read into memory
+MMAP_THRESHOLD = 1 << 24
+# Lines are split from the buffer this many bytes at a time
+CHUNK_SIZE = 1 << 16
+# Seconds to wait on a stalled connection before giving up on a download
+DOWNLOAD_TIMEOUT = 30
 
-__all__ = ["fetch_input"]
+# The umask can only be read by setting it, so read it once, before any threads start
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
+Buffer = bytes | mmap.mmap
+PartFn = Callable[[Iterator[str]], Any]
 
-def fetch_input(puzzle_id: int) -> Iterator[str]:
-    """Fetch the puzzle input remotely or from local disk cache.
+__all__ = [
+    "PartFn",
+    "PuzzleInput",
+    "fetch_input",
+    "find_solutions",
+    "get_cache_file",
+    "get_part",
+    "get_process_context",
+    "import_solution",
+    "parse_input",
+    "prefetch_inputs",
+    "solve_part",
+    "write_atomically",
+]
+
+
+class PuzzleInput:
+    def __init__(self, buffer: Buffer, path: Path | None = None) -> None:
+        """Create a puzzle input held in a single buffer.
+
+        Iterating over the input yields its lines, split from the buffer a chunk at
+        a time, so it can be iterated over any number of times (including
+        concurrently) without every line being held in memory at once.
+
+        Args
+        ----
+            buffer (Buffer): the raw puzzle input, in memory or memory mapped.
+            path (Path | None, optional): the file the input was read from, if any.
+                Defaults to None.
+        """
+        self._buffer = buffer
+        self._path = path
+
+    @classmethod
+    def from_file(cls: type["PuzzleInput"], path: Path) -> "PuzzleInput":
+        """Read a puzzle input from a file, memory mapping it if it is large.
+
+        Args
+        ----
+            path (Path): the input file.
+
+        Raises
+        ------
+            IOError: if the file can't be read.
+
+        Returns
+        -------
+            PuzzleInput: the puzzle input.
+        """
+        with path.open(mode="rb") as f:
+            size = path.stat().st_size
+            if size < MMAP_THRESHOLD:
+                return cls(f.read(), path)
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the lines of the input, without line endings."""
+        return _iter_chunked_lines(self._buffer, partial(str, encoding=UTF8), "\n")
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Iterate over the undecoded lines of the input, without line endings."""
+        return _iter_chunked_lines(self._buffer, bytes, b"\n")
+
+    def iter_views(self) -> Iterator[memoryview]:
+        """Iterate over views of each line of the input, without line endings.
+
+        No line is copied, which suits solutions that only need to look at a few
+        bytes of each line.
+        """
+        return _iter_views(self._buffer)
+
+    def digest(self) -> bytes:
+        """The SHA-256 digest of the raw input bytes."""
+        return hashlib.sha256(self._buffer).digest()
+
+    def __bytes__(self) -> bytes:
+        """Get the raw puzzle input."""
+        return bytes(self._buffer)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Memory maps can't be pickled, so map the file again wherever it's unpickled
+        if isinstance(self._buffer, mmap.mmap) and self._path is not None:
+            return (self.__class__.from_file, (self._path,))
+        return (self.__class__, (bytes(self._buffer), self._path))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{len(self._buffer)} bytes>)"
+
+
+def import_solution(puzzle_id: int) -> ModuleType | None:
+    """Import the solution module for a puzzle, if it has been written.
 
     Args
     ----
         puzzle_id (int): the puzzle ID (day number).
 
+    Returns
+    -------
+        ModuleType | None: the solution module, or None if it doesn't exist yet.
+    """
+    try:
+        return importlib.import_module(f"aoc_2022.day_{puzzle_id:02}")
+    except ModuleNotFoundError:
+        return None
+
+
+def find_solutions(
+    puzzle_ids: Iterable[int] = range(1, 26)
+) -> Iterator[tuple[int, int]]:
+    """Find every part of every solution that has been written.
+
+    Args
+    ----
+        puzzle_ids (Iterable[int], optional): the puzzle IDs (day numbers) to look
+            for. Defaults to every day.
+
     Yields
     ------
-        Iterator[str]: an iterator of the input lines.
+        Iterator[tuple[int, int]]: the puzzle ID and part number of each part.
+    """
+    for puzzle_id in puzzle_ids:
+        if (module := import_solution(puzzle_id)) is None:
+            continue
+
+        for part_number in (1, 2):
+            if hasattr(module, f"part_{part_number}"):
+                yield (puzzle_id, part_number)
+
+
+def parse_input(module: ModuleType, data: PuzzleInput) -> Any:
+    """Parse the puzzle input once, to be shared by both parts of a solution.
+
+    Solutions may define a `parse(data)` hook, in which case both of their parts take
+    its result instead of the input lines. Parts must copy anything they mutate.
+
+    Args
+    ----
+        module (ModuleType): the solution module.
+        data (PuzzleInput): the puzzle input.
+
+    Returns
+    -------
+        Any: the parsed input, or the puzzle input itself if there is no parse hook.
+    """
+    if (parse := getattr(module, "parse", None)) is None:
+        return data
+    return parse(iter(data))
+
+
+def solve_part(module: ModuleType, part_number: int, parsed: Any) -> Any:
+    """Solve one part of a solution using the result of `parse_input`.
+
+    Args
+    ----
+        module (ModuleType): the solution module.
+        part_number (int): the part number.
+        parsed (Any): the result of `parse_input` for the solution.
+
+    Returns
+    -------
+        Any: the answer to the part.
+    """
+    part_fn = getattr(module, f"part_{part_number}")
+    if not hasattr(module, "parse"):
+        return part_fn(iter(parsed))
+    return part_fn(parsed)
+
+
+def get_part(module: ModuleType, part_number: int) -> PartFn:
+    """Get one part of a solution as a function of the input lines.
+
+    Args
+    ----
+        module (ModuleType): the solution module.
+        part_number (int): the part number.
+
+    Returns
+    -------
+        PartFn: the part, preceded by the solution's parse hook if it has one.
+    """
+    part_fn: PartFn = getattr(module, f"part_{part_number}")
+    if not hasattr(module, "parse"):
+        return part_fn
+    parse: Callable[[Iterator[str]], Any] = module.parse
+
+    def parse_then_solve(data: Iterator[str]) -> Any:
+        return part_fn(parse(data))
+
+    return parse_then_solve
+
+
+def get_process_context() -> ForkServerContext | SpawnContext:
+    """Get a way to start processes that's safe whilst other threads are running.
+
+    A forked child only gets the thread that forked it, so a lock held by any other
+    thread at the time stays locked forever in the child.
+
+    Returns
+    -------
+        ForkServerContext | SpawnContext: a forkserver context where the platform
+            has one, or else a spawn context.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def get_cache_file(puzzle_id: int) -> Path:
+    """Get the path a puzzle's input is cached at.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+
+    Returns
+    -------
+        Path: the cache file path, which may not exist yet.
     """
+    return CACHE_DIR.joinpath(f"input_{puzzle_id:02}.txt")
+
+
+def fetch_input(puzzle_id: int, input_id: str | None = None) -> PuzzleInput:
+    """Fetch the puzzle input remotely or from local disk cache.
+
+    Args
+    ----
+        puzzle_id (int): the puzzle ID (day number).
+        input_id (str | None, optional): the name of an input in the input store to
+            read instead, such as another account's input. Defaults to None.
+
+    Raises
+    ------
+        input_store.MissingInputError: if there is no such input in the input store.
+        ValueError: if the stored input is corrupt.
+
+    Returns
+    -------
+        PuzzleInput: the puzzle input, which iterates over the input lines.
+    """
+    if input_id is not None:
+        return PuzzleInput(input_store.load_input(puzzle_id, input_id))
+
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    cache_file = CACHE_DIR.joinpath(f"input_{puzzle_id:02}.txt")
+    cache_file = get_cache_file(puzzle_id)
 
     try:
-        with cache_file.open(mode="r", encoding=UTF8) as f:
-            yield from _iter_text(f)
-            return
+        return PuzzleInput.from_file(cache_file)
     except IOError:
         pass
 
-    with ENV_FILE.open(mode="r", encoding=UTF8) as f:
-        env = json.load(f)
-
     request = urllib.request.Request(
         url=URL.format(puzzle_id),
-        headers={"User-Agent": "dev@wallparty.horse"},
+        headers={"User-Agent": USER_AGENT},
         method="GET",
     )
 
     host = urllib.parse.urlsplit(URL).hostname
-    _add_cookie_to_request("session", env["cookie"], host, request)
+    _add_cookie_to_request("session", _read_session_cookie(), host, request)
 
     try:
         with urllib.request.urlopen(request) as f:
-            # No nice way of streaming result as iterator, must decode from bytes first
-            data = f.read().decode(UTF8)
+            write_atomically(_iter_response(f), cache_file)
 
-            with cache_file.open(mode="w", encoding=UTF8) as f:
-                f.write(data)
-
-            yield from data.splitlines()
+        return PuzzleInput.from_file(cache_file)
     except urllib.error.HTTPError as e:
         print(f"Response failed with code {e.code}, {e.reason}")
-        return
+        return PuzzleInput(b"")
+
+
+def prefetch_inputs(
+    puzzle_ids: Iterable[int],
+    url: str = URL,
+    max_connections: int = 4,
+    on_fetched: Callable[[int], None] | None = None,
+) -> list[int]:
+    """Download every puzzle input that isn't cached yet, reusing connections.
+
+    Each connection is kept alive and used for one download after another, so at
+    most `max_connections` requests are ever in flight.
+
+    Args
+    ----
+        puzzle_ids (Iterable[int]): the puzzle IDs (day numbers) to download.
+        url (str, optional): the input URL, with a placeholder for the puzzle ID.
+            Defaults to URL.
+        max_connections (int, optional): the number of connections to download
+            over concurrently. Defaults to 4.
+        on_fetched (Callable[[int], None] | None, optional): called with each puzzle
+            ID as soon as its input is cached, or its download has failed, from
+            whichever thread fetched it. Defaults to None.
+
+    Returns
+    -------
+        list[int]: the puzzle IDs that were downloaded, in order. Any that failed
+            are reported and left out, without stopping the rest.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    if on_fetched is None:
+        on_fetched = _ignore
+
+    to_download: queue.SimpleQueue[int] = queue.SimpleQueue()
+    for puzzle_id in puzzle_ids:
+        if get_cache_file(puzzle_id).exists():
+            on_fetched(puzzle_id)
+        else:
+            to_download.put(puzzle_id)
+
+    if to_download.empty():
+        return []
+
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Cookie": f"session={_read_session_cookie()}",
+    }
+    download_all = partial(_download_all, to_download, url, headers, on_fetched)
+
+    num_connections = min(max_connections, to_download.qsize())
+    with ThreadPoolExecutor(max_workers=num_connections) as executor:
+        futures = [executor.submit(download_all) for _ in range(num_connections)]
+        downloaded = [puzzle_id for f in futures for puzzle_id in f.result()]
+
+    return sorted(downloaded)
+
+
+def write_atomically(chunks: Iterable[bytes], path: Path) -> None:
+    """Write a file so that it only ever appears complete.
+
+    Args
+    ----
+        chunks (Iterable[bytes]): the file contents, a chunk at a time.
+        path (Path): the file to write, whose directory must already exist.
+    """
+    # Stream into a temporary file beside the destination, only renaming it into
+    # place once complete, so an interrupted write never leaves a truncated file
+    with tempfile.NamedTemporaryFile(
+        mode="wb", dir=path.parent, prefix=f"{path.name}.", delete=False
+    ) as f:
+        try:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+            # Temporary files are private to their owner, so give the file the
+            # permissions it would have had if opened as normal
+            os.chmod(f.name, 0o666 & ~_UMASK)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+
+    os.replace(f.name, path)
+
+
+def _download_all(
+    to_download: queue.SimpleQueue[int],
+    url: str,
+    headers: dict[str, str],
+    on_fetched: Callable[[int], None],
+) -> list[int]:
+    split_url = urllib.parse.urlsplit(url)
+    connection_type = (
+        http.client.HTTPSConnection
+        if split_url.scheme == "https"
+        else http.client.HTTPConnection
+    )
+    connection = connection_type(split_url.netloc, timeout=DOWNLOAD_TIMEOUT)
+
+    downloaded: list[int] = []
+    try:
+        while True:
+            try:
+                puzzle_id = to_download.get_nowait()
+            except queue.Empty:
+                return downloaded
+
+            path = urllib.parse.urlsplit(url.format(puzzle_id)).path
+            try:
+                if _download(connection, path, headers, get_cache_file(puzzle_id)):
+                    downloaded.append(puzzle_id)
+            except (OSError, http.client.HTTPException) as e:
+                # The connection may be left part way through a response, so start
+                # afresh for the next day rather than giving up on them all
+                connection.close()
+                print(f"Download of day {puzzle_id} failed: {e!r}")
+            on_fetched(puzzle_id)
+    finally:
+        connection.close()
+
+
+def _download(
+    connection: http.client.HTTPConnection,
+    path: str,
+    headers: dict[str, str],
+    cache_file: Path,
+) -> bool:
+    def get() -> http.client.HTTPResponse:
+        connection.request("GET", path, headers=headers)
+        return connection.getresponse()
+
+    try:
+        response = get()
+    except (http.client.RemoteDisconnected, ConnectionResetError):
+        # The server closed the idle connection, so reconnect and retry once
+        connection.close()
+        response = get()
+
+    if response.status != 200:
+        # The body must still be read for the connection to be reused
+        response.read()
+        print(f"Response failed with code {response.status}, {response.reason}")
+        return False
+
+    write_atomically(_iter_response(response), cache_file)
+    return True
+
+
+def _iter_response(response: http.client.HTTPResponse) -> Iterator[bytes]:
+    received = 0
+    for chunk in iter(partial(response.read, CHUNK_SIZE), b""):
+        received += len(chunk)
+        yield chunk
+
+    # Reading in chunks doesn't notice if the server hangs up early, so check here
+    expected = response.getheader("Content-Length")
+    if expected is not None and received < int(expected):
+        raise http.client.IncompleteRead(b"", int(expected) - received)
+
+
+def _ignore(puzzle_id: int) -> None:
+    pass
+
+
+def _read_session_cookie() -> str:
+    with ENV_FILE.open(mode="r", encoding=UTF8) as f:
+        env = json.load(f)
+    return str(env["cookie"])
+
+
+def _iter_chunked_lines(
+    buffer: Buffer, convert: Callable[[memoryview], AnyStr], newline: AnyStr
+) -> Iterator[AnyStr]:
+    view = memoryview(buffer)
+    # Annotated, as the walrus assignments in the loop leave mypy unable to infer them
+    start: int = 0
+    end = len(buffer)
+    ends_with_newline = buffer[end - 1 : end] == b"\n"
+
+    while start < end:
+        # Cut each chunk at its last newline, so that every chunk holds whole lines
+        # that can be converted and split in one go
+        limit: int = start + CHUNK_SIZE
+        if limit >= end:
+            stop = end
+        elif (stop := buffer.rfind(b"\n", start, limit)) == -1:
+            # A single line is longer than a chunk, so take all of it
+            if (stop := buffer.find(b"\n", limit)) == -1:
+                stop = end
+
+        lines = convert(view[start:stop]).split(newline)
+        if stop == end and ends_with_newline:
+            lines.pop()
+
+        yield from lines
+        start = stop + 1
+
 
+def _iter_views(buffer: Buffer) -> Iterator[memoryview]:
+    view = memoryview(buffer)
+    start, end = 0, len(buffer)
 
-def _iter_text(f: TextIO) -> Iterator[str]:
-    while (line := f.readline()) != "":
-        yield line[: len(line) - 1]
+    while start < end:
+        if (stop := buffer.find(b"\n", start)) == -1:
+            stop = end
+        yield view[start:stop]
+        start = stop + 1
 
 
 def _add_cookie_to_request(
@@ -0,0 +1,47 @@
+import math
+from typing import Callable
+
+import pytest
+
+from aoc_2022.bench import bench_part
+from aoc_2022.generators import generate_lines
+
+from .utils import get_part_fn
+
+SCALE_FACTOR = 4
+# The fastest of several runs is the least disturbed by anything else on the machine
+REPEATS = 9
+# How much faster than its declared complexity a part may appear to grow, to allow for
+# timing noise, e.g. 0.5 lets linear growth through but catches quadratic growth
+SLACK = 0.5
+
+ScalingCheck = Callable[[int, int, float], None]
+
+
+@pytest.fixture
+def assert_scaling(request: pytest.FixtureRequest) -> ScalingCheck:
+    """Assert that a part's runtime grows no faster than its complexity marker allows.
+
+    The test must be marked with `pytest.mark.complexity(exponent)`, where the runtime
+    is expected to grow with the amount of generated input raised to that exponent.
+    Marked tests are deselected by default, so run them with `pytest -m complexity`.
+    """
+    marker = request.node.get_closest_marker("complexity")
+    if marker is None:
+        raise ValueError("tests using assert_scaling must have a complexity marker")
+    exponent: float = marker.args[0]
+
+    def check(puzzle_id: int, part_number: int, scale: float) -> None:
+        part_fn = get_part_fn(puzzle_id, part_number)
+
+        def time_at(input_scale: float) -> float:
+            lines = list(generate_lines(puzzle_id, input_scale))
+            return min(bench_part(part_fn, lines, REPEATS, 0))
+
+        growth = math.log(time_at(scale * SCALE_FACTOR) / time_at(scale), SCALE_FACTOR)
+        if growth > exponent + SLACK:
+            pytest.fail(
+                f"runtime grew as n^{growth:.2f}, expected no worse than n^{exponent:g}"
+            )
+
+    return check
@@ -0,0 +1,97 @@
+import importlib
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from aoc_2022 import answers, main, utils
+
+DAY_01_INPUT = "1000\n2000\n\n3000\n\n500\n"
+
+
+@pytest.fixture
+def day_01(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> list[int]:
+    """Cache day 1's input in a temporary directory, counting each time it's solved."""
+    monkeypatch.setattr(utils, "CACHE_DIR", tmp_path / "input")
+    monkeypatch.setattr(answers, "ANSWER_CACHE_DIR", tmp_path / "answers")
+    utils.CACHE_DIR.mkdir()
+    utils.get_cache_file(1).write_text(DAY_01_INPUT)
+
+    module = utils.import_solution(1)
+    assert module is not None
+    solve = module.main
+    solved: list[int] = []
+
+    def counted_main(data: utils.PuzzleInput) -> Any:
+        solved.append(1)
+        return solve(data)
+
+    monkeypatch.setattr(module, "main", counted_main)
+    return solved
+
+
+def test_answers_are_cached(
+    day_01: list[int], capsys: pytest.CaptureFixture[str]
+) -> None:
+    main.main(["run", "1"])
+    main.main(["run", "1"])
+
+    assert len(day_01) == 1
+    assert capsys.readouterr().out.splitlines() == ["01 ->     3000,     6500"] * 2
+    assert list(answers.ANSWER_CACHE_DIR.iterdir()) == [
+        answers.ANSWER_CACHE_DIR / "answers_01.json"
+    ]
+
+
+def test_answers_are_solved_again_for_a_new_input(
+    day_01: list[int], capsys: pytest.CaptureFixture[str]
+) -> None:
+    main.main(["run", "1"])
+    utils.get_cache_file(1).write_text("4000\n")
+    main.main(["run", "1"])
+
+    assert len(day_01) == 2
+    assert capsys.readouterr().out.splitlines()[1] == "01 ->     4000,     4000"
+
+
+def test_answers_are_not_cached_with_no_cache(day_01: list[int]) -> None:
+    main.main(["run", "1"])
+    main.main(["run", "1", "--no-cache"])
+    main.main(["run", "1", "--no-cache"])
+
+    assert len(day_01) == 3
+
+
+def test_load_answers_needs_matching_key(day_01: list[int]) -> None:
+    answers.save_answers(1, "abc", (1, 2))
+
+    assert answers.load_answers(1, "abc") == (1, 2)
+    assert answers.load_answers(1, "def") is None
+    assert answers.load_answers(2, "abc") is None
+
+
+def test_key_changes_with_dependency_source(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, day_01: list[int]
+) -> None:
+    package = tmp_path / "fake_package"
+    package.mkdir()
+    package.joinpath("__init__.py").write_text("")
+    package.joinpath("helpers.py").write_text("def double(x):\n    return 2 * x\n")
+    package.joinpath("day_01.py").write_text("from .helpers import double\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(answers, "PACKAGE_NAME", "fake_package")
+
+    # Forget the fake package's modules again afterwards
+    for name in ("fake_package", "fake_package.helpers", "fake_package.day_01"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    module = importlib.import_module("fake_package.day_01")
+    key = answers.make_key(1, module)
+
+    assert answers.make_key(1, module) == key
+
+    # Edit a module the solution imports from, but not the solution itself
+    package.joinpath("helpers.py").write_text("def double(x):\n    return x + x\n")
+
+    assert answers.make_key(1, module) != key
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from aoc_2022 import batch
+
+DAY_01_INPUT = "1000\n2000\n\n3000\n"
+
+
+def exit_on_crash(puzzle_id: int, input_file: Path) -> batch.BatchResult:
+    if "crash" in input_file.name:
+        os._exit(3)
+    return batch.BatchResult(puzzle_id, str(input_file), [puzzle_id], 0.0)
+
+
+@pytest.fixture
+def inputs_dir(tmp_path: Path) -> Path:
+    tmp_path.joinpath("alice").mkdir()
+    tmp_path.joinpath("alice", "input_01.txt").write_text(DAY_01_INPUT)
+    tmp_path.joinpath("alice", "input_02.txt").write_text("A Y\nB X\nC Z\n")
+    tmp_path.joinpath("input_01_stress.txt").write_text(DAY_01_INPUT + "\n9000\n")
+    tmp_path.joinpath("notes.txt").write_text("not an input")
+    return tmp_path
+
+
+def test_find_inputs(inputs_dir: Path) -> None:
+    assert batch.find_inputs(inputs_dir) == [
+        (1, inputs_dir / "alice" / "input_01.txt"),
+        (1, inputs_dir / "input_01_stress.txt"),
+        (2, inputs_dir / "alice" / "input_02.txt"),
+    ]
+
+
+def test_find_inputs_for_one_day(inputs_dir: Path) -> None:
+    assert [p.name for _, p in batch.find_inputs(inputs_dir, 2)] == ["input_02.txt"]
+
+
+def test_solve_input_reports_errors(tmp_path: Path) -> None:
+    input_file = tmp_path.joinpath("input_02.txt")
+    input_file.write_text("not a strategy guide\n")
+
+    result = batch.solve_input(2, input_file)
+
+    assert result.answers is None
+    assert result.error is not None
+
+
+def test_run_batch(inputs_dir: Path) -> None:
+    results = batch.run_batch(batch.find_inputs(inputs_dir), jobs=2)
+
+    answers = {Path(r.input_file).name: r.answers for r in results}
+
+    assert answers == {
+        "input_01.txt": [3000, 6000],
+        "input_01_stress.txt": [9000, 15000],
+        "input_02.txt": [15, 12],
+    }
+
+
+def test_run_batch_survives_a_dying_worker(
+    inputs_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inputs_dir.joinpath("input_01_crash.txt").write_text(DAY_01_INPUT)
+    monkeypatch.setattr(batch, "solve_input", exit_on_crash)
+
+    results = batch.run_batch(batch.find_inputs(inputs_dir), jobs=2)
+
+    outcomes = {Path(r.input_file).name: r.answers or r.error for r in results}
+
+    assert outcomes == {
+        "input_01.txt": [1],
+        "input_01_crash.txt": "RuntimeError('died with exit code 3')",
+        "input_01_stress.txt": [1],
+        "input_02.txt": [2],
+    }
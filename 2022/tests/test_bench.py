@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from aoc_2022 import main
+from aoc_2022.bench import (
+    BenchResult,
+    check_baseline,
+    read_history,
+    save_baseline,
+    summarise,
+)
+
+
+def test_summarise_single_sample() -> None:
+    assert summarise([0.5]) == (0.5, 0.5, 0.5, 0.0)
+
+
+def test_summarise() -> None:
+    samples = [float(i) for i in range(1, 21)]
+
+    minimum, median, p95, stddev = summarise(samples)
+
+    assert minimum == 1.0
+    assert median == 10.5
+    assert p95 == pytest.approx(19.05)
+    assert stddev == pytest.approx(5.916, abs=1e-3)
+
+
+def make_result(part_number: int, median: float) -> BenchResult:
+    return BenchResult(1, part_number, None, median, median, median, 0.0, 1)
+
+
+def test_check_baseline(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    save_baseline([make_result(1, 1.0), make_result(2, 1.0)], baseline)
+
+    assert check_baseline([make_result(1, 1.1), make_result(2, 0.5)], 0.15, baseline)
+    assert not check_baseline([make_result(1, 1.2)], 0.15, baseline)
+
+
+def test_check_baseline_ignores_new_parts(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    save_baseline([make_result(1, 1.0)], baseline)
+
+    assert check_baseline([make_result(2, 100.0)], 0.15, baseline)
+
+
+def test_check_baseline_needs_a_baseline(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    baseline, output = tmp_path / "baseline.json", tmp_path / "bench.json"
+
+    status = main.main(
+        ["bench", "1", "--check-baseline", "--baseline", str(baseline)]
+        + ["--output", str(output)]
+    )
+
+    assert status == 1
+    assert capsys.readouterr().out == (
+        f"No baseline at {baseline}; run with --save-baseline first\n"
+    )
+    assert not output.exists()
+
+
+def test_bench_appends_each_run(tmp_path: Path) -> None:
+    output = tmp_path / "bench.ndjson"
+
+    for repeat in ("2", "3"):
+        main.main(
+            ["bench", "1", "--repeat", repeat, "--scale", "0.01"]
+            + ["--output", str(output)]
+        )
+
+    history = read_history(output)
+    assert [report["repeat"] for report in history] == [2, 3]
+    assert history[0]["timestamp"] <= history[1]["timestamp"]
+    assert [r["runs"] for r in history[1]["results"]] == [3, 3]
@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from aoc_2022 import budgets, main
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def sleep(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def allocate(size: int) -> int:
+    return len(bytearray(size))
+
+
+def fail() -> None:
+    raise ValueError("bad input")
+
+
+def die() -> None:
+    os._exit(3)
+
+
+def start_sleeper(pid_file: Path) -> None:
+    # Like a split day's pool workers, which outlive the day unless killed with it
+    sleeper = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    pid_file.write_text(str(sleeper.pid))
+    time.sleep(60)
+
+
+def is_running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            # The state comes after the command, which is in parentheses
+            return f.read().rpartition(")")[2].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_read_budgets(tmp_path: Path) -> None:
+    path = tmp_path / "budgets.toml"
+    path.write_text("seconds = 10\nmemory_mib = 512\n\n[day_12]\nseconds = 60\n")
+
+    day_budgets = budgets.read_budgets(path, memory_mib=1024)
+
+    assert day_budgets.for_day(1) == budgets.Budget(10, 1024)
+    assert day_budgets.for_day(12) == budgets.Budget(60, 1024)
+
+
+def test_read_budgets_without_file() -> None:
+    day_budgets = budgets.read_budgets(seconds=5)
+
+    assert day_budgets.for_day(3) == budgets.Budget(5, None)
+
+
+def test_run_within() -> None:
+    assert budgets.run_within(budgets.Budget(10, 512), add, 1, 2) == 3
+
+
+def test_run_within_time_budget() -> None:
+    start = time.monotonic()
+
+    with pytest.raises(TimeoutError):
+        budgets.run_within(budgets.Budget(seconds=0.5), sleep, 30)
+
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.skipif(not Path("/proc").is_dir(), reason="needs /proc")
+def test_run_within_time_budget_kills_subprocesses(tmp_path: Path) -> None:
+    pid_file = tmp_path / "sleeper.pid"
+
+    with pytest.raises(TimeoutError):
+        budgets.run_within(budgets.Budget(seconds=2), start_sleeper, pid_file)
+
+    sleeper_pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while is_running(sleeper_pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not is_running(sleeper_pid)
+
+
+def test_run_within_memory_budget() -> None:
+    with pytest.raises(MemoryError):
+        budgets.run_within(budgets.Budget(memory_mib=256), allocate, 1 << 30)
+
+
+def test_run_within_raises() -> None:
+    with pytest.raises(ValueError, match="bad input"):
+        budgets.run_within(budgets.Budget(), fail)
+
+
+def test_run_within_reports_dying() -> None:
+    with pytest.raises(RuntimeError, match="exit code 3"):
+        budgets.run_within(budgets.Budget(), die)
+
+
+def test_run_one_reports_dying(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def run_within(*args: Any) -> None:
+        raise RuntimeError("died with exit code 3")
+
+    monkeypatch.setattr(budgets, "run_within", run_within)
+
+    main.run_one(4, day_budgets=budgets.Budgets())
+
+    assert capsys.readouterr().out == (
+        "04 -> failed with RuntimeError('died with exit code 3')\n"
+    )
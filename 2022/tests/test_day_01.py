@@ -0,0 +1,17 @@
+import pytest
+
+from aoc_2022.day_01 import read_calories, top_calories
+
+DATA = ["1000", "2000", "", "4000", "", "", "5000", "6000", "", "0", "", "10000"]
+
+
+def test_read_calories() -> None:
+    assert list(read_calories(iter(DATA))) == [3000, 4000, 11000, 0, 10000]
+
+
+@pytest.mark.parametrize(
+    "k,expected",
+    [(1, [11000]), (3, [11000, 10000, 4000]), (9, [11000, 10000, 4000, 3000, 0])],
+)
+def test_top_calories(k: int, expected: list[int]) -> None:
+    assert top_calories(iter(DATA), k) == expected
@@ -0,0 +1,38 @@
+import pytest
+
+from aoc_2022.generators import GENERATORS, generate_lines
+
+from .utils import get_part_fn
+
+SCALE = 0.05
+
+
+@pytest.mark.parametrize("puzzle_id", GENERATORS, ids=lambda x: f"day_{x:02}")
+@pytest.mark.parametrize("part_number", (1, 2), ids=lambda x: f"part_{x}")
+def test_generated_input_is_solvable(puzzle_id: int, part_number: int) -> None:
+    part_fn = get_part_fn(puzzle_id, part_number)
+
+    assert part_fn(generate_lines(puzzle_id, SCALE)) is not None
+
+
+@pytest.mark.parametrize("puzzle_id", GENERATORS, ids=lambda x: f"day_{x:02}")
+def test_generated_input_is_seeded(puzzle_id: int) -> None:
+    first = list(generate_lines(puzzle_id, SCALE, seed=1))
+    second = list(generate_lines(puzzle_id, SCALE, seed=1))
+
+    assert first == second
+
+
+@pytest.mark.parametrize("scale", [0.01, SCALE, 1])
+def test_generated_program_fills_the_screen(scale: float) -> None:
+    cycles = sum(
+        1 if line == "noop" else 2 for line in generate_lines(10, scale, seed=2)
+    )
+    screen = get_part_fn(10, 2)(generate_lines(10, scale, seed=2))
+
+    assert cycles >= 240
+    assert [len(row) for row in str(screen).splitlines()] == [40] * 6
+
+
+def test_generated_input_scales() -> None:
+    assert len(list(generate_lines(2, 10))) == 10 * len(list(generate_lines(2, 1)))
@@ -0,0 +1,121 @@
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from aoc_2022 import input_store, main, utils
+
+INPUTS = {
+    (1, "default"): b"1000\n2000\n\n3000\n",
+    (1, "alice"): b"4000\n\n5000\n6000\n",
+    (2, "default"): b"A Y\nB X\nC Z\n",
+}
+
+
+@pytest.fixture(autouse=True)
+def store_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(input_store, "STORE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def stored() -> dict[tuple[int, str], bytes]:
+    for (puzzle_id, input_id), data in INPUTS.items():
+        input_store.add_input(puzzle_id, input_id, [data])
+    return INPUTS
+
+
+def corrupt_byte(path: Path, offset: int) -> None:
+    with path.open(mode="r+b") as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_stored_inputs_are_loaded(stored: dict[tuple[int, str], bytes]) -> None:
+    for (puzzle_id, input_id), data in stored.items():
+        assert bytes(input_store.load_input(puzzle_id, input_id)) == data
+        assert b"".join(input_store.iter_input(puzzle_id, input_id)) == data
+
+
+def test_missing_input_lists_stored_ids(stored: dict[tuple[int, str], bytes]) -> None:
+    with pytest.raises(input_store.MissingInputError) as excinfo:
+        input_store.load_input(1, "bob")
+
+    message = "no input 'bob' for day 01 in the store, which has 'alice', 'default'"
+    assert str(excinfo.value) == message
+    with pytest.raises(KeyError, match="which has none for that day"):
+        input_store.iter_input(3, "default")
+
+
+def test_run_reports_missing_input(
+    stored: dict[tuple[int, str], bytes], capsys: pytest.CaptureFixture[str]
+) -> None:
+    main.main(["run", "1", "--input-id", "bob"])
+
+    assert capsys.readouterr().out == (
+        "01 -> failed with MissingInputError(\"no input 'bob' for day 01 in the "
+        "store, which has 'alice', 'default'\")\n"
+    )
+
+
+def test_large_input_is_streamed() -> None:
+    data = os.urandom(utils.CHUNK_SIZE * 3)
+    chunks = [data[i : i + 1000] for i in range(0, len(data), 1000)]
+
+    input_store.add_input(1, "big", chunks)
+
+    assert len(list(input_store.iter_input(1, "big"))) > 1
+    assert bytes(input_store.load_input(1, "big")) == data
+
+
+def test_empty_input_is_loaded() -> None:
+    input_store.add_input(1, "empty", [])
+
+    assert input_store.load_input(1, "empty") == b""
+
+
+def test_readded_input_replaces_old_one(stored: dict[tuple[int, str], bytes]) -> None:
+    input_store.add_input(1, "default", [b"7000\n"])
+
+    assert bytes(input_store.load_input(1, "default")) == b"7000\n"
+    assert bytes(input_store.load_input(1, "alice")) == stored[(1, "alice")]
+
+
+def test_missing_input_raises() -> None:
+    with pytest.raises(KeyError):
+        input_store.load_input(3, "default")
+
+
+def test_blobs_file_is_gzip(
+    store_dir: Path, stored: dict[tuple[int, str], bytes]
+) -> None:
+    blobs = store_dir.joinpath(input_store.BLOBS_FILE_NAME).read_bytes()
+
+    assert gzip.decompress(blobs) == b"".join(stored.values())
+
+
+@pytest.mark.parametrize("where", ("header", "middle", "trailer"))
+def test_corrupt_input_raises(
+    store_dir: Path, stored: dict[tuple[int, str], bytes], where: str
+) -> None:
+    entry = input_store.read_index()[input_store.get_key(1, "alice")]
+    offsets = {
+        "header": entry.offset + 3,
+        "middle": entry.offset + entry.length // 2,
+        "trailer": entry.offset + entry.length - 1,
+    }
+    corrupt_byte(store_dir.joinpath(input_store.BLOBS_FILE_NAME), offsets[where])
+
+    with pytest.raises(ValueError, match="corrupt"):
+        input_store.load_input(1, "alice")
+
+    # The neighbouring inputs are unaffected
+    assert bytes(input_store.load_input(1, "default")) == stored[(1, "default")]
+    assert bytes(input_store.load_input(2, "default")) == stored[(2, "default")]
+
+
+def test_fetch_input_reads_from_store(stored: dict[tuple[int, str], bytes]) -> None:
+    assert list(utils.fetch_input(1, "alice")) == ["4000", "", "5000", "6000"]
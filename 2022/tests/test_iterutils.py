@@ -0,0 +1,187 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import mul
+from typing import Any, Callable, Iterable
+
+import pytest
+
+from aoc_2022 import iterutils
+
+
+def negate(x: int) -> int:
+    return -x
+
+
+def test_batched() -> None:
+    assert list(iterutils.batched(range(7), 3)) == [(0, 1, 2), (3, 4, 5), (6,)]
+    assert list(iterutils.batched([], 3)) == []
+
+
+def test_group_amounts_keeps_none() -> None:
+    groups = iterutils.group_amounts(iter([1, None, 2, 3]), 2)
+
+    assert [list(group) for group in groups] == [[1, None], [2, 3]]
+
+
+def test_sliding_window() -> None:
+    windows = iterutils.sliding_window("abcd", 3)
+
+    assert list(windows) == [("a", "b", "c"), ("b", "c", "d")]
+    assert list(iterutils.sliding_window("ab", 3)) == []
+
+
+def test_rolling_sum() -> None:
+    sums = iterutils.rolling(iter([1, 2, 3, 4, 5]), 2, iterutils.RollingSum())
+
+    assert list(sums) == [3, 5, 7, 9]
+
+
+def test_rolling_distinct_count() -> None:
+    counts = iterutils.rolling("aabcbd", 3, iterutils.DistinctCount[str]())
+
+    assert list(counts) == [2, 3, 2, 3]
+    assert list(iterutils.rolling("ab", 3, iterutils.DistinctCount[str]())) == []
+
+
+@pytest.mark.parametrize(
+    "window_fn",
+    [
+        iterutils.batched,
+        iterutils.sliding_window,
+        lambda items, n: iterutils.rolling(items, n, iterutils.RollingSum()),
+    ],
+    ids=["batched", "sliding_window", "rolling"],
+)
+def test_windows_check_sizes(window_fn: Callable[[Iterable[int], int], Any]) -> None:
+    with pytest.raises(ValueError):
+        next(window_fn(range(3), 0))
+
+
+def test_sized_iterator() -> None:
+    items = iterutils.SizedIterator.of(range(5))
+
+    assert len(items) == 5
+    assert next(items) == 0
+    assert len(items) == 4
+    assert list(items) == [1, 2, 3, 4]
+    assert len(items) == 0
+
+
+def test_sized_iterator_of_slice() -> None:
+    items = iterutils.SizedIterator.of_slice("abcdefgh", 1, None, 3)
+
+    assert len(items) == 3
+    assert "".join(items) == "beh"
+
+
+def test_counting_iterator() -> None:
+    items = iterutils.CountingIterator(i for i in range(4))
+
+    assert items.count == 0
+    assert sum(items) == 6
+    assert items.count == 4
+
+
+@pytest.mark.parametrize(
+    "iterable",
+    [
+        range(4),
+        [0, 1, 2, 3],
+        iterutils.SizedIterator.of([0, 1, 2, 3]),
+        (i for i in range(4)),
+    ],
+    ids=["range", "list", "sized", "generator"],
+)
+def test_iter_len(iterable: Iterable[int]) -> None:
+    items, length = iterutils.iter_len(iterable)
+
+    assert length == 4
+    assert list(items) == [0, 1, 2, 3]
+
+
+def test_iter_len_doesnt_read_sized_iterators() -> None:
+    read: list[int] = []
+    items = iterutils.SizedIterator(map(read.append, range(3)), 3)
+
+    assert iterutils.iter_len(items)[1] == 3
+    assert read == []
+
+
+def test_pmap() -> None:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = iterutils.pmap(negate, range(1000), executor, chunk_size=7)
+
+        assert list(results) == [-i for i in range(1000)]
+
+
+def test_pmap_in_processes() -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = iterutils.pmap(negate, range(100), executor, chunk_size=10)
+
+        assert list(results) == [-i for i in range(100)]
+
+
+def test_pmap_unordered() -> None:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = iterutils.pmap(
+            negate, range(1000), executor, chunk_size=7, ordered=False, max_pending=3
+        )
+
+        assert sorted(results) == sorted(-i for i in range(1000))
+
+
+def test_pmap_without_executor_is_lazy() -> None:
+    results = iterutils.pmap(negate, iter(range(10**12)))
+
+    assert next(results) == 0
+
+
+def test_pmap_reads_ahead_only_so_far() -> None:
+    items = iter(range(1000))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = iterutils.pmap(negate, items, executor, chunk_size=10, max_pending=2)
+        assert next(results) == 0
+
+    assert next(items) == 30
+
+
+def test_pstarmap() -> None:
+    pairs = [(i, i + 1) for i in range(100)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = iterutils.pstarmap(mul, pairs, executor, chunk_size=9)
+
+        assert list(results) == [a * b for a, b in pairs]
+
+
+def test_pmap_raises() -> None:
+    with ThreadPoolExecutor() as executor:
+        with pytest.raises(ZeroDivisionError):
+            list(iterutils.pstarmap(divmod, [(1, 1), (1, 0)], executor))
+
+
+@pytest.mark.parametrize("chunk_size,max_pending", [(0, 1), (1, 0)])
+def test_pmap_checks_sizes(chunk_size: int, max_pending: int) -> None:
+    with pytest.raises(ValueError):
+        iterutils.pmap(negate, [], None, chunk_size, max_pending=max_pending)
+
+
+def test_instrument_disabled_is_a_no_op() -> None:
+    items = iter(range(3))
+
+    assert iterutils.instrument("stage", items) is items
+
+
+def test_instrument() -> None:
+    with iterutils.instrumentation() as stages:
+        squares = iterutils.instrument("squares", map(mul, range(5), range(5)))
+        evens = iterutils.instrument("evens", filter(lambda i: i % 2 == 0, squares))
+        assert sum(evens) == 20
+
+    assert stages["squares"].items == 5
+    assert stages["evens"].items == 3
+    assert stages["evens"].seconds >= stages["squares"].seconds
+    assert iterutils.instrument("later", range(3)) == range(3)
+
+    report = iterutils.format_stage_report(stages).splitlines()
+    assert [line.split()[:2] for line in report] == [["squares", "5"], ["evens", "3"]]
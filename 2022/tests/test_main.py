@@ -0,0 +1,153 @@
+import os
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+import pytest
+
+from aoc_2022 import budgets, main, pipeline, utils
+from aoc_2022.generators import generate_lines
+from aoc_2022.utils import PuzzleInput
+
+DAYS = range(1, 6)
+
+
+@pytest.fixture
+def fetched(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Fetch inputs last day first."""
+    fetched: list[int] = []
+
+    def prefetch_inputs(
+        puzzle_ids: Iterable[int],
+        url: str,
+        max_connections: int,
+        on_fetched: Callable[[int], None],
+    ) -> list[int]:
+        for puzzle_id in reversed(list(puzzle_ids)):
+            time.sleep(0.01)
+            fetched.append(puzzle_id)
+            on_fetched(puzzle_id)
+        return fetched
+
+    monkeypatch.setattr(utils, "prefetch_inputs", prefetch_inputs)
+    monkeypatch.setattr(utils, "import_solution", lambda p: main if p in DAYS else None)
+    return fetched
+
+
+@pytest.fixture
+def in_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Solve days in this process, as they're faked here."""
+    monkeypatch.setattr(budgets, "run_within", lambda budget, fn, *args: fn(*args))
+
+
+def exit_on_day_3(puzzle_id: int, **kwargs: Any) -> main.Solved:
+    if puzzle_id == 3:
+        os._exit(3)
+    return main.Solved(puzzle_id, (puzzle_id, -puzzle_id))
+
+
+def test_run_all_solves_each_day_once_fetched(
+    in_process: None,
+    fetched: list[int],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    solved_after_fetching: list[bool] = []
+
+    def solve_one(puzzle_id: int, **kwargs: Any) -> main.Solved:
+        solved_after_fetching.append(puzzle_id in fetched)
+        return main.Solved(puzzle_id, (puzzle_id, -puzzle_id))
+
+    monkeypatch.setattr(main, "solve_one", solve_one)
+
+    main.run_all(2)
+
+    assert fetched == [5, 4, 3, 2, 1]
+    assert solved_after_fetching == [True] * 5
+    days = [line.split()[0] for line in capsys.readouterr().out.splitlines()]
+    assert days == ["01", "02", "03", "04", "05"]
+
+
+def test_run_all_closes_pipeline_when_printing_fails(
+    in_process: None, fetched: list[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def print_solved(solved: main.Solved, output_format: str) -> None:
+        raise BrokenPipeError()
+
+    closed: list[bool] = []
+    solve_pipelined = pipeline.solve_pipelined
+
+    def tracked_solve_pipelined(*args: Any) -> Iterator[Any]:
+        try:
+            yield from solve_pipelined(*args)
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(main, "solve_one", lambda p, **kwargs: main.Solved(p, (1, 2)))
+    monkeypatch.setattr(main, "print_solved", print_solved)
+    monkeypatch.setattr(pipeline, "solve_pipelined", tracked_solve_pipelined)
+
+    with pytest.raises(BrokenPipeError) as excinfo:
+        main.run_all(2)
+
+    # The traceback keeps the pipeline alive, so it has to have been closed already
+    assert excinfo.traceback
+    assert closed == [True]
+
+
+def test_run_all_keeps_day_order_and_isolates_failures(
+    in_process: None,
+    fetched: list[int],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    def solve_one(puzzle_id: int, **kwargs: Any) -> main.Solved:
+        # Later days finish first
+        time.sleep(0.01 * (len(DAYS) - puzzle_id))
+        if puzzle_id == 3:
+            raise ValueError("bad day")
+        return main.Solved(puzzle_id, (puzzle_id, -puzzle_id))
+
+    monkeypatch.setattr(main, "solve_one", solve_one)
+
+    main.run_all(len(DAYS))
+
+    assert capsys.readouterr().out.splitlines() == [
+        "01 ->        1,       -1",
+        "02 ->        2,       -2",
+        "03 -> failed with ValueError('bad day')",
+        "04 ->        4,       -4",
+        "05 ->        5,       -5",
+    ]
+
+
+def test_run_all_survives_a_dying_day(
+    fetched: list[int],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr(main, "solve_one", exit_on_day_3)
+
+    main.run_all(2)
+
+    assert capsys.readouterr().out.splitlines() == [
+        "01 ->        1,       -1",
+        "02 ->        2,       -2",
+        "03 -> failed with RuntimeError('died with exit code 3')",
+        "04 ->        4,       -4",
+        "05 ->        5,       -5",
+    ]
+
+
+@pytest.mark.parametrize("puzzle_id", [1, 8], ids=["day_01", "day_08"])
+def test_split_parts_gives_same_answers(
+    monkeypatch: pytest.MonkeyPatch, puzzle_id: int
+) -> None:
+    lines = generate_lines(puzzle_id, scale=0.25)
+    data = PuzzleInput("\n".join(lines).encode())
+    monkeypatch.setattr(utils, "fetch_input", lambda p, input_id: data)
+
+    whole = main.solve_one(puzzle_id, use_cache=False)
+    split = main.solve_one(puzzle_id, use_cache=False, split_parts=True)
+
+    assert whole is not None and split is not None
+    assert split.answers == whole.answers
@@ -0,0 +1,112 @@
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator
+
+import pytest
+
+from aoc_2022 import parse_cache, utils
+from aoc_2022.generators import generate_lines
+from aoc_2022.utils import PuzzleInput
+
+CACHEABLE_IDS = [8, 11, 12]
+
+
+@pytest.fixture(autouse=True)
+def parse_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(parse_cache, "PARSE_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def make_input(puzzle_id: int, seed: int = 0) -> PuzzleInput:
+    lines = generate_lines(puzzle_id, scale=0.25, seed=seed)
+    return PuzzleInput("\n".join(lines).encode())
+
+
+def import_solution(puzzle_id: int) -> ModuleType:
+    module = utils.import_solution(puzzle_id)
+    assert module is not None
+    return module
+
+
+@pytest.mark.parametrize("puzzle_id", CACHEABLE_IDS, ids="day_{:02}".format)
+def test_unpacked_input_gives_same_answers(puzzle_id: int) -> None:
+    module = import_solution(puzzle_id)
+    data = make_input(puzzle_id)
+
+    parsed = utils.parse_input(module, data)
+    unpacked = module.unpack(memoryview(module.pack(parsed)))
+
+    for part_number in (1, 2):
+        assert utils.solve_part(module, part_number, unpacked) == utils.solve_part(
+            module, part_number, parsed
+        )
+
+
+@pytest.mark.parametrize(
+    "tree_grid",
+    [[[1, 2, 3, 4], [5, 6, 7, 8]], [[1], [2], [3]], []],
+    ids=["wide", "tall", "empty"],
+)
+def test_unpacked_grid_keeps_its_shape(tree_grid: list[list[int]]) -> None:
+    module = import_solution(8)
+
+    assert module.unpack(memoryview(module.pack(tree_grid))) == tree_grid
+
+
+@pytest.mark.parametrize("puzzle_id", CACHEABLE_IDS, ids="day_{:02}".format)
+def test_cached_input_is_loaded(
+    monkeypatch: pytest.MonkeyPatch, puzzle_id: int
+) -> None:
+    module = import_solution(puzzle_id)
+    data = make_input(puzzle_id)
+    expected = utils.solve_part(module, 1, parse_cache.parse_cached(module, data))
+
+    def fail(*_: object) -> None:
+        raise AssertionError("parsed again despite a cached copy")
+
+    monkeypatch.setattr(module, "parse", fail)
+
+    assert utils.solve_part(module, 1, parse_cache.parse_cached(module, data)) == (
+        expected
+    )
+
+
+def test_changed_input_is_parsed_again() -> None:
+    module = import_solution(12)
+    parse_cache.parse_cached(module, make_input(12, seed=0))
+
+    changed = make_input(12, seed=1)
+
+    assert utils.solve_part(
+        module, 1, parse_cache.parse_cached(module, changed)
+    ) == utils.solve_part(module, 1, utils.parse_input(module, changed))
+
+
+def test_new_parser_version_is_parsed_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    module = import_solution(11)
+    data = make_input(11)
+    parse_cache.parse_cached(module, data)
+    calls: list[Iterator[str]] = []
+
+    def parse(lines: Iterator[str]) -> list[Any]:
+        calls.append(lines)
+        return []
+
+    monkeypatch.setattr(module, "PARSER_VERSION", module.PARSER_VERSION + 1)
+    monkeypatch.setattr(module, "parse", parse)
+
+    parse_cache.parse_cached(module, data)
+
+    assert len(calls) == 1
+
+
+def test_uncacheable_module_is_parsed_normally(parse_cache_dir: Path) -> None:
+    module = import_solution(7)
+    data = make_input(7)
+
+    parsed = parse_cache.parse_cached(module, data)
+
+    assert utils.solve_part(module, 1, parsed) == utils.solve_part(
+        module, 1, utils.parse_input(module, data)
+    )
+    assert not any(parse_cache_dir.iterdir())
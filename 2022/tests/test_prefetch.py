@@ -0,0 +1,181 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from aoc_2022 import pipeline, utils
+
+
+def read_input(puzzle_id: int) -> str:
+    if puzzle_id == 3:
+        raise ValueError("can't solve day 3")
+    return utils.get_cache_file(puzzle_id).read_text()
+
+
+class InputHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: list[tuple[str, int]] = []
+    truncated: set[str] = set()
+
+    def do_GET(self) -> None:
+        self.requests.append((self.path, self.client_address[1]))
+
+        if self.headers["Cookie"] != "session=abc":
+            self.send_error(400)
+            return
+
+        body = f"input for {self.path}\n".encode()
+        if self.path.endswith("/big/input"):
+            body *= 100_000
+
+        self.send_response(200)
+        if self.path.endswith("/truncated/input") or self.path in self.truncated:
+            # Promise more than is sent, then hang up part way through
+            self.send_header("Content-Length", str(len(body) * 2))
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+            self.close_connection = True
+            return
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def input_url(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[str]:
+    env_file = tmp_path / ".env"
+    env_file.write_text('{"cookie": "abc"}')
+    monkeypatch.setattr(utils, "ENV_FILE", env_file)
+    monkeypatch.setattr(utils, "CACHE_DIR", tmp_path / "input")
+
+    InputHandler.requests = []
+    InputHandler.truncated = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), InputHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}/day/{{}}/input"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_prefetch_inputs(input_url: str) -> None:
+    downloaded = utils.prefetch_inputs(range(1, 11), input_url, max_connections=2)
+
+    assert downloaded == list(range(1, 11))
+    assert utils.get_cache_file(7).read_text() == "input for /day/7/input\n"
+
+    # Connections are kept alive, so only as many are opened as were allowed
+    client_ports = {port for _, port in InputHandler.requests}
+    assert len(InputHandler.requests) == 10
+    assert len(client_ports) <= 2
+
+
+def test_prefetch_inputs_skips_cached(input_url: str) -> None:
+    utils.CACHE_DIR.mkdir()
+    utils.get_cache_file(2).write_text("cached\n")
+
+    downloaded = utils.prefetch_inputs(range(1, 4), input_url)
+
+    assert downloaded == [1, 3]
+    assert utils.get_cache_file(2).read_text() == "cached\n"
+
+
+def test_prefetch_inputs_streams_large_inputs(input_url: str) -> None:
+    big_url = input_url.replace("{}", "{}/big")
+
+    assert utils.prefetch_inputs([1], big_url) == [1]
+    expected_size = len(b"input for /day/1/big/input\n") * 100_000
+    assert utils.get_cache_file(1).stat().st_size == expected_size
+
+
+def test_prefetch_inputs_never_leaves_truncated_files(
+    input_url: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    truncated_url = input_url.replace("{}", "{}/truncated")
+
+    assert utils.prefetch_inputs([1], truncated_url) == []
+
+    assert list(utils.CACHE_DIR.iterdir()) == []
+    assert "Download of day 1 failed: IncompleteRead" in capsys.readouterr().out
+
+
+def test_prefetch_inputs_carries_on_after_a_failure(
+    input_url: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    InputHandler.truncated = {"/day/2/input"}
+    fetched: list[int] = []
+
+    downloaded = utils.prefetch_inputs(
+        range(1, 5), input_url, max_connections=1, on_fetched=fetched.append
+    )
+
+    assert downloaded == [1, 3, 4]
+    assert fetched == [1, 2, 3, 4]
+    assert not utils.get_cache_file(2).exists()
+    assert "Download of day 2 failed" in capsys.readouterr().out
+
+
+def test_prefetch_inputs_when_unreachable(
+    input_url: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # Nothing listens on port 1, so every download fails, but each is still reported
+    unreachable_url = "http://127.0.0.1:1/day/{}/input"
+
+    assert utils.prefetch_inputs([1, 2], unreachable_url) == []
+
+    out = capsys.readouterr().out
+    assert "Download of day 1 failed" in out
+    assert "Download of day 2 failed" in out
+
+
+def test_prefetch_inputs_reports_each_fetched(input_url: str) -> None:
+    utils.CACHE_DIR.mkdir()
+    utils.get_cache_file(2).write_text("cached\n")
+    fetched: list[int] = []
+
+    utils.prefetch_inputs(range(1, 4), input_url, on_fetched=fetched.append)
+
+    assert sorted(fetched) == [1, 2, 3]
+
+
+def test_solve_pipelined(input_url: str) -> None:
+    utils.CACHE_DIR.mkdir()
+    utils.get_cache_file(2).write_text("cached\n")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        solutions = list(
+            pipeline.solve_pipelined(read_input, range(1, 6), executor, input_url, 2)
+        )
+
+    assert [puzzle_id for puzzle_id, _ in solutions] == [1, 2, 3, 4, 5]
+    assert solutions[0][1].result() == "input for /day/1/input\n"
+    assert solutions[1][1].result() == "cached\n"
+    with pytest.raises(ValueError):
+        solutions[2][1].result()
+    assert solutions[4][1].result() == "input for /day/5/input\n"
+
+
+def test_solve_pipelined_when_downloads_fail(input_url: str) -> None:
+    # Nothing listens on port 1, so every download fails and solving reports it
+    unreachable_url = "http://127.0.0.1:1/day/{}/input"
+
+    with ThreadPoolExecutor() as executor:
+        solutions = dict(
+            pipeline.solve_pipelined(read_input, [1, 2], executor, unreachable_url)
+        )
+
+    for solution in solutions.values():
+        with pytest.raises(FileNotFoundError):
+            solution.result()
@@ -0,0 +1,86 @@
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from aoc_2022 import main, profiling
+
+
+def busy(seconds: float) -> str:
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+    return "done"
+
+
+def allocate(size: int) -> int:
+    return len(bytearray(size))
+
+
+def test_profile(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path / "profile")
+
+    with profiling.profile("day_01.part_1"):
+        busy(0.01)
+
+    stats = pstats.Stats(str(profiling.PROFILE_DIR / "day_01.part_1.pstats"))
+    assert "busy" in stats.get_stats_profile().func_profiles
+
+
+def test_trace_alloc(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path / "profile")
+
+    with profiling.trace_alloc("day_01.part_1"):
+        kept = bytearray(1024 * 1024)
+
+    report = (profiling.PROFILE_DIR / "day_01.part_1.alloc.txt").read_text()
+    assert int(report.splitlines()[0].split()[3]) >= len(kept)
+    assert "test_profiling.py" in report
+
+
+def test_measure_times() -> None:
+    result, measurement = profiling.measure("day_01.part_1", busy, 0.05)
+
+    assert result == "done"
+    assert measurement.label == "day_01.part_1"
+    assert measurement.cpu_seconds >= 0.05
+    assert measurement.wall_seconds >= measurement.cpu_seconds * 0.5
+
+
+def test_measure_peak_rss() -> None:
+    size = 64 * 1024 * 1024
+
+    _, small = profiling.measure("small", allocate, 1)
+    _, large = profiling.measure("large", allocate, size)
+
+    assert large.peak_rss_kib >= size // 1024
+    assert large.peak_rss_kib > small.peak_rss_kib
+
+
+def test_records() -> None:
+    solved = main.Solved(
+        7,
+        (95437, 24933642),
+        [
+            profiling.Measurement("day_07.parse", 0.1, 0.1, 1000),
+            profiling.Measurement("day_07.part_1", 0.2, 0.2, 2000),
+            profiling.Measurement("day_07.part_2", 0.3, 0.3, 3000),
+        ],
+    )
+
+    records = main.get_records(solved)
+
+    assert [(r["stage"], r["answer"]) for r in records] == [
+        ("parse", None),
+        ("part_1", 95437),
+        ("part_2", 24933642),
+    ]
+    assert records[2] == {
+        "day": 7,
+        "stage": "part_2",
+        "answer": 24933642,
+        "wall_seconds": 0.3,
+        "cpu_seconds": 0.3,
+        "peak_rss_kib": 3000,
+    }
@@ -0,0 +1,45 @@
+import pytest
+
+from .conftest import ScalingCheck
+
+# Exponents of the amount of generated input, which is lines for most days but cells
+# for the grid days, so e.g. linear in cells is quadratic in the side of the grid
+LINEAR = 1.0
+QUADRATIC = 2.0
+CUBIC_IN_SIDE = 1.5
+
+SCALING_INPUT = [
+    pytest.param(1, 1, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(1, 2, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(2, 1, 0.2, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(2, 2, 0.2, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(3, 1, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(3, 2, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(4, 1, 0.2, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(4, 2, 0.2, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(5, 1, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(5, 2, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(6, 1, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(6, 2, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(7, 1, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(7, 2, 0.5, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(8, 1, 0.02, marks=pytest.mark.complexity(LINEAR)),
+    # Each tree looks along its whole row and column
+    pytest.param(8, 2, 0.02, marks=pytest.mark.complexity(CUBIC_IN_SIDE)),
+    pytest.param(9, 1, 0.1, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(9, 2, 0.1, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(10, 1, 1, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(10, 2, 1, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(11, 1, 0.125, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(11, 2, 0.125, marks=pytest.mark.complexity(LINEAR)),
+    pytest.param(12, 1, 0.07, marks=pytest.mark.complexity(LINEAR)),
+    # A path is searched for from every lowest square
+    pytest.param(12, 2, 0.07, marks=pytest.mark.complexity(QUADRATIC)),
+]
+
+
+@pytest.mark.parametrize("puzzle_id,part_number,scale", SCALING_INPUT, ids=str)
+def test_scaling(
+    puzzle_id: int, part_number: int, scale: float, assert_scaling: ScalingCheck
+) -> None:
+    assert_scaling(puzzle_id, part_number, scale)
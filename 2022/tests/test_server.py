@@ -0,0 +1,117 @@
+import re
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import pytest
+
+from aoc_2022 import client, main, server
+
+
+def echo(argv: Sequence[str]) -> int:
+    print(" ".join(argv))
+    print("to stderr", file=sys.stderr)
+    return 3
+
+
+@pytest.fixture
+def socket_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[Path]:
+    # Requests change into the client's directory, so make sure it's put back
+    monkeypatch.chdir(tmp_path)
+    socket_path = tmp_path / "aoc.sock"
+
+    with server.SolverServer(socket_path, main.main) as solver_server:
+        thread = threading.Thread(target=solver_server.serve_forever)
+        thread.start()
+        yield socket_path
+        solver_server.shutdown()
+        thread.join()
+
+
+def test_handle_request(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    response = server.handle_request(echo, {"argv": ["run", "1"], "cwd": "."})
+
+    assert response == {"status": 3, "stdout": "run 1\n", "stderr": "to stderr\n"}
+
+
+def test_handle_request_only_forwards_some_actions() -> None:
+    response = server.handle_request(echo, {"argv": ["serve"], "cwd": "."})
+
+    assert response["status"] == 2
+
+
+def test_handle_request_reports_exit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    request = {"argv": ["run", "--bogus"], "cwd": "."}
+
+    response = server.handle_request(main.main, request)
+
+    assert response["status"] == 2
+    assert "--bogus" in response["stderr"]
+
+
+def test_forward(socket_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    socket_path.parent.joinpath("input").mkdir()
+    socket_path.parent.joinpath("input", "input_01.txt").write_text("1\n\n2\n")
+
+    status = client.forward(["run", "1", "--no-cache"], socket_path)
+
+    assert status == 0
+    assert capsys.readouterr().out.split() == ["01", "->", "2,", "3"]
+
+
+def test_reload_changed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(server, "SOLUTION_MODULE_PATTERN", re.compile("^$"))
+    forward = client.forward
+    mtimes = server.get_source_mtimes()
+
+    assert server.reload_changed(mtimes) == mtimes
+    assert sys.modules["aoc_2022.client"].forward is forward
+
+    server.reload_changed({**mtimes, "aoc_2022.client": 0})
+
+    assert sys.modules["aoc_2022.client"].forward is not forward
+
+
+def test_forward_reports_reload_errors(
+    socket_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    def reload_changed(mtimes: dict[str, int]) -> dict[str, int]:
+        raise SyntaxError("invalid syntax")
+
+    monkeypatch.setattr(server, "reload_changed", reload_changed)
+
+    # A request too big for the socket's buffer is still being written if the server
+    # replies before reading it
+    status = client.forward(["run", "1", "x" * (1 << 20)], socket_path)
+
+    assert status == 1
+    assert "SyntaxError: invalid syntax" in capsys.readouterr().err
+
+
+def test_forward_reports_missing_response(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    socket_path = tmp_path / "silent.sock"
+
+    class SilentHandler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            # Read the request, then hang up without answering
+            self.request.recv(4096)
+
+    with socketserver.UnixStreamServer(str(socket_path), SilentHandler) as silent:
+        thread = threading.Thread(target=silent.handle_request)
+        thread.start()
+        status = client.forward(["run", "1"], socket_path)
+        thread.join()
+
+    assert status == 1
+    assert "malformed response" in capsys.readouterr().err
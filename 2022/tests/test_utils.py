@@ -0,0 +1,82 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from aoc_2022 import utils
+from aoc_2022.utils import PuzzleInput
+
+LINES_INPUT = {
+    b"": [],
+    b"abc": ["abc"],
+    b"abc\n": ["abc"],
+    b"abc\n\ndef": ["abc", "", "def"],
+    b"abc\ndef\n\n": ["abc", "def", ""],
+}
+
+
+@pytest.mark.parametrize(
+    "buffer,expected", LINES_INPUT.items(), ids=map(repr, LINES_INPUT)
+)
+def test_puzzle_input_lines(buffer: bytes, expected: list[str]) -> None:
+    assert list(PuzzleInput(buffer)) == expected
+
+
+def test_puzzle_input_is_reusable() -> None:
+    data = PuzzleInput(b"1\n2\n3\n")
+
+    first, second = iter(data), iter(data)
+
+    assert next(first) == "1"
+    assert list(second) == ["1", "2", "3"]
+    assert list(first) == ["2", "3"]
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 3, 5))
+@pytest.mark.parametrize(
+    "buffer,expected", LINES_INPUT.items(), ids=map(repr, LINES_INPUT)
+)
+def test_puzzle_input_lines_across_chunks(
+    monkeypatch: pytest.MonkeyPatch, chunk_size: int, buffer: bytes, expected: list[str]
+) -> None:
+    monkeypatch.setattr(utils, "CHUNK_SIZE", chunk_size)
+
+    assert list(PuzzleInput(buffer)) == expected
+
+
+@pytest.mark.parametrize(
+    "buffer,expected", LINES_INPUT.items(), ids=map(repr, LINES_INPUT)
+)
+def test_puzzle_input_undecoded_lines(buffer: bytes, expected: list[str]) -> None:
+    data = PuzzleInput(buffer)
+    expected_bytes = [line.encode() for line in expected]
+
+    assert list(data.iter_bytes()) == expected_bytes
+    assert list(map(bytes, data.iter_views())) == expected_bytes
+
+
+def test_puzzle_input_memory_mapped(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(utils, "MMAP_THRESHOLD", 0)
+    input_file = tmp_path / "input.txt"
+    input_file.write_bytes(b"abc\ndef\n")
+
+    data = PuzzleInput.from_file(input_file)
+
+    assert list(data) == ["abc", "def"]
+    assert list(pickle.loads(pickle.dumps(data))) == ["abc", "def"]
+
+
+def test_write_atomically(tmp_path: Path) -> None:
+    written, opened = tmp_path / "written.txt", tmp_path / "opened.txt"
+
+    utils.write_atomically([b"abc\n", b"def\n"], written)
+    opened.write_bytes(b"")
+
+    assert written.read_bytes() == b"abc\ndef\n"
+    assert written.stat().st_mode == opened.stat().st_mode
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "opened.txt",
+        "written.txt",
+    ]
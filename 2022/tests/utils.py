@@ -1,9 +1,11 @@
 import importlib
+import tomllib
 from itertools import cycle
 from pathlib import Path
-import tomllib
 from typing import Any, Callable, Iterator, cast
 
+from aoc_2022 import utils
+
 ProblemInput = Iterator[str]
 ProblemOutput = int | str
 PartFn = Callable[[ProblemInput], ProblemOutput]
@@ -49,11 +51,12 @@ def get_part_fn(puzzle_id: int, part_number: int) -> PartFn:
 
     Returns
     -------
-        PartFn: the function that runs a part of the solution.
+        PartFn: the function that runs a part of the solution, parsing the input first
+            if the solution has a parse hook.
     """
     module_name = f"aoc_2022.day_{puzzle_id:02}"
     module = importlib.import_module(module_name)
-    return cast(PartFn, module.__getattribute__(f"part_{part_number}"))
+    return cast(PartFn, utils.get_part(module, part_number))
 
 
 def generate_parameters() -> Iterator[tuple[int, int, Data]]:
@@ -63,16 +66,12 @@ def generate_parameters() -> Iterator[tuple[int, int, Data]]:
     ------
         Iterator[tuple[int, int, Data]]: the test function parameters.
     """
-    for puzzle_id in range(1, 26):
-        for part_number in (1, 2):
-            if not _has_written_solution(puzzle_id, part_number):
-                continue
-
-            all_test_data = _read_test_data(puzzle_id, part_number)
-            if all_test_data is None:
-                continue
+    for puzzle_id, part_number in utils.find_solutions():
+        all_test_data = _read_test_data(puzzle_id, part_number)
+        if all_test_data is None:
+            continue
 
-            yield from ((puzzle_id, part_number, data) for data in all_test_data)
+        yield from ((puzzle_id, part_number, data) for data in all_test_data)
 
 
 def _read_test_data(puzzle_id: int, part_number: int) -> Iterator[Data] | None:
@@ -91,12 +90,3 @@ def _read_test_data(puzzle_id: int, part_number: int) -> Iterator[Data] | None:
         pass
 
     return None
-
-
-def _has_written_solution(puzzle_id: int, part_number: int) -> bool:
-    try:
-        get_part_fn(puzzle_id, part_number)
-    except (ModuleNotFoundError, AttributeError):
-        return False
-
-    return True